@@ -11,6 +11,13 @@ class Settings(BaseSettings):
     schwab_callback_url: str = "https://127.0.0.1:8182/callback"
     schwab_token_path: str = "./schwab_token.json"
     schwab_account_hash: str = ""
+    # Response cache TTLs (seconds); 0 disables caching for that endpoint
+    schwab_quote_ttl_sec: float = 1.0
+    schwab_account_ttl_sec: float = 5.0
+    schwab_price_history_ttl_sec: float = 30.0
+    schwab_option_chain_ttl_sec: float = 10.0
+    schwab_requests_per_minute: int = 120       # Schwab's documented API limit
+    schwab_stream_symbols: str = "SPY"          # comma-separated LEVELONE_EQUITIES subs; "" = REST only
 
     # Trading
     trading_mode: str = Field(default="paper", pattern="^(paper|live)$")
@@ -48,6 +55,9 @@ class Settings(BaseSettings):
     high_iv_rank_threshold: float = 80.0      # IV rank > 80 → 50% size reduction for debit buyers
     # Portfolio delta exposure cap: max |delta| = 10% of equity / underlying price
     max_portfolio_delta_pct: float = 0.10     # 10% of equity in delta-adjusted notional
+    # In-memory closed-trade history cap (all trades are persisted to the DB);
+    # oldest entries are dropped beyond this. 0 = unbounded.
+    max_closed_trades_in_memory: int = 10_000
 
     # AI intelligence layer (Claude Haiku for news + adversarial trade advisor)
     # Set via ANTHROPIC_API_KEY environment variable or .env file.
@@ -76,6 +76,9 @@ async def lifespan(app: FastAPI):
     if trading_engine.running:
         await trading_engine.stop()
 
+    from app.services.schwab_client import schwab_client
+    await schwab_client.aclose()
+
 
 app = FastAPI(
     title="SPY DayTrader",
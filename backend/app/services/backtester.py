@@ -235,6 +235,13 @@ class Backtester:
         current_date = None
         regime = MarketRegime.RANGE_BOUND
 
+        # Vectorised entry pre-screens on the 1-min frame; generate_signal is
+        # only called on bars a strategy's mask marks as candidates
+        bulk_signals = {
+            name: s.generate_signals_bulk(df)
+            for name, s in self.strategy_instances.items()
+        }
+
         for idx in range(30, len(df)):
             bar = df.iloc[idx]
             bar_time = df.index[idx]
@@ -515,6 +522,9 @@ class Backtester:
                             df_15min=df_15min.iloc[:fifteen_idx + 1],
                         )
                     else:
+                        hits = bulk_signals[strat_name]
+                        if hits is not None and not hits[idx]:
+                            continue
                         signal = strategy.generate_signal(df, idx, bar_time)
 
                     if signal:
@@ -25,11 +25,12 @@ class SchwabChainProvider:
         self, symbol: str, dte_min: int = 5, dte_max: int = 14,
     ) -> Optional[OptionChainSnapshot]:
         try:
-            from app.services.schwab_client import schwab_client
+            from app.services.schwab_client import schwab_client, response_json
             if not schwab_client._client:
                 return None
 
-            resp = schwab_client._client.get_option_chain(
+            resp = await schwab_client._call(
+                schwab_client._client.get_option_chain,
                 symbol,
                 contract_type=None,  # ALL
                 strike_count=30,
@@ -40,7 +41,7 @@ class SchwabChainProvider:
                 logger.warning(f"Schwab chain request failed: {resp.status_code}")
                 return None
 
-            data = resp.json()
+            data = response_json(resp)
             return self._parse_schwab_chain(data, symbol)
         except ImportError:
             return None
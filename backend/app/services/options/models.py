@@ -1,11 +1,14 @@
 """Options domain models: legs, orders, chain snapshots."""
 
 from __future__ import annotations
+import math
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Optional
 
+import numpy as np
+
 
 class OptionType(str, Enum):
     CALL = "CALL"
@@ -90,7 +93,7 @@ OPTIONS_EXIT_RULES: dict[OptionsStrategyType, dict] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class OptionLeg:
     """A single option contract leg."""
     contract_symbol: str          # OCC symbol e.g. SPY250228C00590000
@@ -123,7 +126,7 @@ class OptionLeg:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class OptionsOrder:
     """A complete options order with one or more legs."""
     strategy_type: OptionsStrategyType
@@ -186,6 +189,10 @@ class OptionChainSnapshot:
     puts: dict = field(default_factory=dict)    # (exp, strike) -> OptionLeg
     iv_rank: float = 50.0         # 0-100 percentile
     iv_percentile: float = 50.0   # 0-100 percentile
+    # Lazily built lookup caches (chains are not mutated once constructed)
+    _by_expiration: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _delta_index: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _strike_arrays: dict = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def get_call(self, expiration: str, strike: float) -> Optional[OptionLeg]:
         return self.calls.get((expiration, strike))
@@ -193,13 +200,51 @@ class OptionChainSnapshot:
     def get_put(self, expiration: str, strike: float) -> Optional[OptionLeg]:
         return self.puts.get((expiration, strike))
 
+    def legs_for_expiration(
+        self, expiration: str, option_type: OptionType,
+    ) -> dict[float, OptionLeg]:
+        """strike -> leg for one expiration, in chain order.
+
+        Both sides are grouped by expiration in a single pass on first use, so
+        per-expiration scans no longer walk the whole chain.
+        """
+        if not self._by_expiration:
+            for side, options in ((OptionType.CALL, self.calls), (OptionType.PUT, self.puts)):
+                for (exp, strike), leg in options.items():
+                    self._by_expiration.setdefault((exp, side), {})[strike] = leg
+        return self._by_expiration.get((expiration, option_type), {})
+
     def strikes_for_expiration(self, expiration: str) -> list[float]:
         """Get sorted list of available strikes for an expiration."""
-        strikes = set()
-        for (exp, strike) in self.calls:
-            if exp == expiration:
-                strikes.add(strike)
-        for (exp, strike) in self.puts:
-            if exp == expiration:
-                strikes.add(strike)
-        return sorted(strikes)
+        return self.strike_array(expiration).tolist()
+
+    def strike_array(self, expiration: str) -> np.ndarray:
+        """Sorted unique strikes (calls and puts) for an expiration, cached."""
+        arr = self._strike_arrays.get(expiration)
+        if arr is None:
+            strikes = set(self.legs_for_expiration(expiration, OptionType.CALL))
+            strikes.update(self.legs_for_expiration(expiration, OptionType.PUT))
+            arr = np.array(sorted(strikes), dtype=float)
+            self._strike_arrays[expiration] = arr
+        return arr
+
+    def delta_index(
+        self, expiration: str, option_type: OptionType,
+    ) -> tuple[list[float], list[int], list[float]]:
+        """Legs of one expiration sorted by |delta|, as parallel lists.
+
+        Returns (abs_deltas, order, strikes); order is each leg's position in
+        the chain so ties resolve the same way a linear scan would.
+        """
+        key = (expiration, option_type)
+        index = self._delta_index.get(key)
+        if index is None:
+            legs = self.legs_for_expiration(expiration, option_type)
+            rows = sorted(
+                (abs(leg.delta), i, strike)
+                for i, (strike, leg) in enumerate(legs.items())
+                if not math.isnan(leg.delta)
+            )
+            index = ([r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows])
+            self._delta_index[key] = index
+        return index
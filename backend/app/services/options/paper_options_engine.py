@@ -1,8 +1,12 @@
 """Paper options trading engine — simulates options P&L via Greeks approximation."""
 
 from __future__ import annotations
+import bisect
+import functools
 import json
 import logging
+import math
+import time
 from datetime import datetime
 from typing import Optional
 from zoneinfo import ZoneInfo
@@ -12,11 +16,23 @@ from app.services.options.models import (
     OptionsOrder, OptionsStrategyType, OPTIONS_EXIT_RULES, STRATEGY_ABBREV,
 )
 from app.services.options import pricing
+from app.services.portfolio_analytics import RunningUlcer, _exit_epoch
 
 logger = logging.getLogger(__name__)
 ET = ZoneInfo("America/New_York")
 
 
+@functools.lru_cache(maxsize=1)
+def _today_start_for_bucket(bucket: int) -> float:
+    """Epoch of today's 00:00 ET, memoized per one-minute monotonic bucket."""
+    now = datetime.now(ET)
+    return now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+
+def _today_start_epoch() -> float:
+    return _today_start_for_bucket(int(time.monotonic() // 60))
+
+
 class PaperOptionPosition:
     """Tracks an open options position with Greeks-based P&L estimation."""
 
@@ -40,9 +56,35 @@ class PaperOptionPosition:
         # Spread cost simulation (5-10% of premium)
         self.spread_cost = self.entry_net_premium * 0.07
 
+        # Per-position dollar constants (contract count is fixed once opened)
+        self._mult = order.contracts * 100
+        self._spread_total = self.spread_cost * self._mult
+        self._entry_notional = self.entry_net_premium * self._mult
+        self._fixed_costs = self.commission + self._spread_total
+
         # Collateral held by broker (set by engine on open)
         self.collateral = 0.0
 
+        # Legs are immutable after open; serialize them once for the trade record
+        self.legs_json = json.dumps(order.legs_to_json())
+
+        # Net position Greeks — legs are fixed at open, so aggregate them once
+        # instead of on every update()
+        self.net_delta = 0.0
+        self.net_gamma = 0.0
+        self.net_theta = 0.0
+        self.net_vega = 0.0
+        for leg in order.legs:
+            sign = -1.0 if "SELL" in leg.action.value else 1.0
+            self.net_delta += sign * leg.delta * leg.quantity
+            self.net_gamma += sign * leg.gamma * leg.quantity
+            self.net_theta += sign * leg.theta * leg.quantity
+            self.net_vega += sign * leg.vega * leg.quantity
+
+        # (underlying_price, dt_days) of the last update(); the mark is a pure
+        # function of these, so a repeat call at the same inputs is a no-op
+        self._last_update: Optional[tuple[float, float]] = None
+
     @property
     def strategy_type(self) -> OptionsStrategyType:
         return self.order.strategy_type
@@ -56,29 +98,21 @@ class PaperOptionPosition:
 
         dt_days: time elapsed in trading days (~1/252 per bar for 1-min bars).
         """
-        dS = underlying_price - self.entry_underlying
-
-        # Aggregate Greeks from all legs (net position)
-        net_delta = 0.0
-        net_gamma = 0.0
-        net_theta = 0.0
+        key = (underlying_price, dt_days)
+        if key == self._last_update:
+            return
+        self._last_update = key
 
-        for leg in self.order.legs:
-            sign = -1.0 if "SELL" in leg.action.value else 1.0
-            net_delta += sign * leg.delta * leg.quantity
-            net_gamma += sign * leg.gamma * leg.quantity
-            net_theta += sign * leg.theta * leg.quantity
+        dS = underlying_price - self.entry_underlying
 
         # Premium change estimate
         premium_change = pricing.estimate_premium_change(
-            net_delta, net_gamma, net_theta, dS, dt_days,
+            self.net_delta, self.net_gamma, self.net_theta, dS, dt_days,
         )
 
-        # For credit spreads, we want the premium to decrease (we sold it)
-        if self.is_credit:
-            self.current_premium = max(0, self.entry_net_premium + premium_change)
-        else:
-            self.current_premium = max(0, self.entry_net_premium + premium_change)
+        # Same mark for credit and debit; raw_pnl applies the direction
+        premium = self.entry_net_premium + premium_change
+        self.current_premium = premium if premium > 0.0 else 0.0
 
         # Track extremes
         self.highest_underlying = max(self.highest_underlying, underlying_price)
@@ -90,13 +124,13 @@ class PaperOptionPosition:
         """Raw P&L from premium movement only (no commission/spread cost).
         Used for stop-loss and take-profit checks."""
         if self.is_credit:
-            return (self.entry_net_premium - self.current_premium) * self.order.contracts * 100
+            return (self.entry_net_premium - self.current_premium) * self._mult
         else:
-            return (self.current_premium - self.entry_net_premium) * self.order.contracts * 100
+            return (self.current_premium - self.entry_net_premium) * self._mult
 
     def unrealized_pnl(self) -> float:
         """Net P&L including commission and spread cost."""
-        return self.raw_pnl() - self.commission - (self.spread_cost * self.order.contracts * 100)
+        return self.raw_pnl() - self._fixed_costs
 
     def pnl_pct_of_max(self) -> float:
         """P&L as percentage of max profit (for exit rules)."""
@@ -109,10 +143,7 @@ class PaperOptionPosition:
         pnl = self.unrealized_pnl()
         if pnl >= 0:
             return 0.0
-        if self.is_credit:
-            return abs(pnl) / (self.entry_net_premium * self.order.contracts * 100)
-        else:
-            return abs(pnl) / (self.entry_net_premium * self.order.contracts * 100)
+        return abs(pnl) / self._entry_notional
 
 
 class PaperOptionsEngine:
@@ -124,6 +155,12 @@ class PaperOptionsEngine:
         self.peak_capital = initial_capital     # DEPRECATED: kept for backward compat
         self.position: Optional[PaperOptionPosition] = None
         self.closed_trades: list[dict] = []
+        # Exit-epoch / P&L index parallel to closed_trades (oldest first) so the
+        # daily helpers bisect to today's trades instead of re-parsing ISO strings
+        self._trade_epochs: list[float] = []
+        self._trade_pnls: list[float] = []
+        # Realized equity-curve drawdown stats, updated per closed trade
+        self._ulcer = RunningUlcer(initial_capital)
         # Peak total-equity tracking (mark-to-market, updated every total_equity() call)
         self._peak_equity: float = initial_capital
         self._last_equity: float = initial_capital
@@ -143,28 +180,30 @@ class PaperOptionsEngine:
             collateral = order.max_loss
             if collateral > self.capital:
                 logger.warning(
-                    f"Insufficient capital for credit spread collateral: "
-                    f"need ${collateral:.0f}, have ${self.capital:.0f}"
+                    "Insufficient capital for credit spread collateral: "
+                    "need $%.0f, have $%.0f", collateral, self.capital,
                 )
                 return None
             self.capital -= collateral
             pos.collateral = collateral
         else:
             # Debit positions: pay the premium
-            cost = abs(order.net_premium) * order.contracts * 100
-            cost += pos.spread_cost * order.contracts * 100
+            cost = pos._entry_notional + pos._spread_total
             if cost > self.capital:
                 logger.warning(
-                    f"Insufficient capital for debit position: "
-                    f"need ${cost:.0f}, have ${self.capital:.0f}"
+                    "Insufficient capital for debit position: "
+                    "need $%.0f, have $%.0f", cost, self.capital,
                 )
                 return None
             self.capital -= cost
             pos.collateral = cost
 
         self.position = pos
-        display = order.to_display_string()
-        logger.info(f"Paper OPTIONS OPEN: {display} | Collateral: ${pos.collateral:.0f}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Paper OPTIONS OPEN: %s | Collateral: $%.0f",
+                order.to_display_string(), pos.collateral,
+            )
         return self.position
 
     def close_position(
@@ -189,22 +228,58 @@ class PaperOptionsEngine:
         self._peak_equity = max(self._peak_equity, self.capital)
 
         trade = self._build_trade_dict(pos, underlying_price, pnl, reason)
-        self.closed_trades.append(trade)
+        self._record_trade(trade)
 
-        abbrev = STRATEGY_ABBREV.get(pos.strategy_type, pos.strategy_type.value)
         logger.info(
-            f"Paper OPTIONS CLOSE {abbrev} | P&L: ${pnl:.2f} | Reason: {reason} | "
-            f"Underlying: ${underlying_price:.2f}"
+            "Paper OPTIONS CLOSE %s | P&L: $%.2f | Reason: %s | Underlying: $%.2f",
+            STRATEGY_ABBREV.get(pos.strategy_type, pos.strategy_type.value),
+            pnl, reason, underlying_price,
         )
         self.position = None
         return trade
 
+    def load_closed_trades(self, trades: list[dict]) -> None:
+        """Replace closed_trades (oldest first) and rebuild the daily index."""
+        self.closed_trades = []
+        self._trade_epochs = []
+        self._trade_pnls = []
+        self._ulcer = RunningUlcer(self._ulcer.base)
+        for t in trades:
+            self._record_trade(t)
+
+    def _record_trade(self, trade: dict) -> None:
+        self.closed_trades.append(trade)
+        self._ulcer.add(float(trade.get("pnl") or 0.0))
+        exit_epoch = _exit_epoch(trade.get("exit_time") or "")
+        if not math.isnan(exit_epoch):
+            self._trade_epochs.append(exit_epoch)
+            self._trade_pnls.append(trade["pnl"])
+
+        # Bound long-running sessions; history lives in the DB
+        cap = settings.max_closed_trades_in_memory
+        if cap > 0 and len(self.closed_trades) > cap:
+            del self.closed_trades[:-cap]
+            del self._trade_epochs[:-cap]
+            del self._trade_pnls[:-cap]
+
+    def ulcer_index(self, initial_capital: float) -> float:
+        """Ulcer Index of the realized equity curve starting at `initial_capital`.
+
+        O(1) per call; rebuilt from closed_trades only when the base changes
+        (e.g. initial capital edited in settings).
+        """
+        if self._ulcer.base != initial_capital:
+            self._ulcer = RunningUlcer(initial_capital)
+            for t in self.closed_trades:
+                self._ulcer.add(float(t.get("pnl") or 0.0))
+        return self._ulcer.value
+
     def _build_trade_dict(
         self, pos: PaperOptionPosition, underlying_price: float,
         pnl: float, reason: str,
     ) -> dict:
         order = pos.order
-        entry_cost = pos.entry_net_premium * order.contracts * 100
+        entry_cost = pos._entry_notional
 
         return {
             "symbol": "SPY",
@@ -229,7 +304,7 @@ class PaperOptionsEngine:
             # Options-specific fields
             "option_strategy_type": order.strategy_type.value,
             "contract_symbol": order.legs[0].contract_symbol if order.legs else "",
-            "legs_json": json.dumps(order.legs_to_json()),
+            "legs_json": pos.legs_json,
             "strike": order.primary_strike,
             "expiration_date": order.primary_expiration,
             "option_type": order.primary_option_type,
@@ -296,33 +371,13 @@ class PaperOptionsEngine:
 
     @property
     def daily_pnl(self) -> float:
-        today = datetime.now(ET).date()
-        total = 0.0
-        for t in reversed(self.closed_trades):
-            try:
-                trade_date = datetime.fromisoformat(t["exit_time"]).date()
-            except (ValueError, KeyError):
-                continue
-            if trade_date == today:
-                total += t["pnl"]
-            elif trade_date < today:
-                break
-        return total
+        i = bisect.bisect_left(self._trade_epochs, _today_start_epoch())
+        return sum(self._trade_pnls[i:])
 
     @property
     def trades_today(self) -> int:
-        today = datetime.now(ET).date()
-        count = 0
-        for t in reversed(self.closed_trades):
-            try:
-                trade_date = datetime.fromisoformat(t["exit_time"]).date()
-            except (ValueError, KeyError):
-                continue
-            if trade_date == today:
-                count += 1
-            elif trade_date < today:
-                break
-        return count
+        i = bisect.bisect_left(self._trade_epochs, _today_start_epoch())
+        return len(self._trade_epochs) - i
 
     @property
     def open_risk(self) -> float:
@@ -341,8 +396,4 @@ class PaperOptionsEngine:
         """
         if self.position is None:
             return 0.0
-        net = 0.0
-        for leg in self.position.order.legs:
-            sign = -1.0 if "SELL" in leg.action.value else 1.0
-            net += sign * leg.delta * leg.quantity
-        return round(net, 4)
+        return round(self.position.net_delta, 4)
@@ -4,8 +4,12 @@ from __future__ import annotations
 import math
 from typing import Optional
 
+import numpy as np
+
 from app.services.options.models import OptionType
 
+SQRT_252 = math.sqrt(252)
+
 
 def _norm_cdf(x: float) -> float:
     """Standard normal CDF approximation (Abramowitz & Stegun)."""
@@ -56,7 +60,7 @@ def black_scholes_price(
         return max(0.0, K - S)
 
     d1_val = _d1(S, K, T, r, sigma)
-    d2_val = _d2(S, K, T, r, sigma)
+    d2_val = d1_val - sigma * math.sqrt(T) if sigma > 0 else 0.0
 
     if option_type == OptionType.CALL:
         return S * _norm_cdf(d1_val) - K * math.exp(-r * T) * _norm_cdf(d2_val)
@@ -95,10 +99,11 @@ def theta(
     """Option theta (per day)."""
     if T <= 0 or sigma <= 0 or S <= 0:
         return 0.0
+    sqrt_T = math.sqrt(T)
     d1_val = _d1(S, K, T, r, sigma)
-    d2_val = _d2(S, K, T, r, sigma)
+    d2_val = d1_val - sigma * sqrt_T
 
-    common = -(S * _norm_pdf(d1_val) * sigma) / (2.0 * math.sqrt(T))
+    common = -(S * _norm_pdf(d1_val) * sigma) / (2.0 * sqrt_T)
 
     if option_type == OptionType.CALL:
         annual_theta = common - r * K * math.exp(-r * T) * _norm_cdf(d2_val)
@@ -144,15 +149,29 @@ def iv_from_atr(atr: float, price: float, bar_minutes: int = 1) -> float:
 
     # Scale intraday ATR to daily ATR
     # A trading day has 390 minutes (6.5 hours)
-    import math as _math
     if bar_minutes < 1440:
         bars_per_day = 390 / max(1, bar_minutes)
-        daily_atr = atr * _math.sqrt(bars_per_day)
+        daily_atr = atr * math.sqrt(bars_per_day)
     else:
         daily_atr = atr
 
     daily_vol = daily_atr / (price * 1.4)
-    iv = daily_vol * math.sqrt(252)
+    iv = daily_vol * SQRT_252
 
     # Clamp to reasonable range: 8% - 120%
     return max(0.08, min(iv, 1.20))
+
+
+def iv_from_atr_array(atr: np.ndarray, price: float, bar_minutes: int = 1) -> np.ndarray:
+    """Vectorized iv_from_atr over an array of ATR values.
+
+    Same scaling and clamping as the scalar version; non-positive ATRs
+    (or a non-positive price) map to the 20% default.
+    """
+    atr = np.asarray(atr, dtype=float)
+    if price <= 0:
+        return np.full(atr.shape, 0.20)
+
+    scale = math.sqrt(390 / max(1, bar_minutes)) if bar_minutes < 1440 else 1.0
+    iv = np.clip(atr * (scale * SQRT_252 / (price * 1.4)), 0.08, 1.20)
+    return np.where(atr > 0, iv, 0.20)
@@ -1,9 +1,16 @@
 """Options selector: maps TradeSignal + MarketRegime + OptionChain -> OptionsOrder."""
 
 from __future__ import annotations
+import bisect
+import functools
 import logging
+from datetime import date, datetime
 from math import ceil
+from operator import itemgetter
 from typing import Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
 
 from app.config import settings
 from app.services.options.models import (
@@ -14,6 +21,115 @@ from app.services.strategies.base import TradeSignal, Direction
 from app.services.strategies.regime_detector import MarketRegime
 
 logger = logging.getLogger(__name__)
+ET = ZoneInfo("America/New_York")
+
+
+@functools.lru_cache(maxsize=2048)
+def _dte(exp_str: str, today: date) -> int:
+    """Days from today to a YYYY-MM-DD expiration.
+
+    Memoized: chains reuse the same few dates all day, and yesterday's keys
+    simply age out after the date rolls.
+    """
+    return (date.fromisoformat(exp_str) - today).days
+
+
+_CREDIT_STRATEGIES = frozenset({
+    OptionsStrategyType.PUT_CREDIT_SPREAD,
+    OptionsStrategyType.CALL_CREDIT_SPREAD,
+    OptionsStrategyType.IRON_CONDOR,
+})
+
+# Map preference string to strategy type, per signal direction
+_PREF_MAP_COMMON: dict[str, OptionsStrategyType] = {
+    "iron_condor": OptionsStrategyType.IRON_CONDOR,
+    "straddle": OptionsStrategyType.LONG_STRADDLE,
+    "strangle": OptionsStrategyType.LONG_STRANGLE,
+    "long_call": OptionsStrategyType.LONG_CALL,
+    "long_put": OptionsStrategyType.LONG_PUT,
+    # Strategy-specific explicit preferences (map directly, bypass IV-rank fallback)
+    "zero_dte_bull_put": OptionsStrategyType.PUT_CREDIT_SPREAD,
+}
+_PREF_MAP_LONG: dict[str, OptionsStrategyType] = {
+    "credit_spread": OptionsStrategyType.PUT_CREDIT_SPREAD,
+    "debit_spread": OptionsStrategyType.CALL_DEBIT_SPREAD,
+    **_PREF_MAP_COMMON,
+}
+_PREF_MAP_SHORT: dict[str, OptionsStrategyType] = {
+    "credit_spread": OptionsStrategyType.CALL_CREDIT_SPREAD,
+    "debit_spread": OptionsStrategyType.PUT_DEBIT_SPREAD,
+    **_PREF_MAP_COMMON,
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _select_strategy_cached(
+    is_long: bool,
+    conf_band: int,
+    regime: MarketRegime,
+    preference: Optional[str],
+    iv_band: int,
+) -> Optional[OptionsStrategyType]:
+    """Strategy decision tree over bucketed inputs (see _select_strategy_type).
+
+    conf_band: 1 = [0.55, 0.65), 2 = [0.65, 0.75), 3 = >= 0.75
+    iv_band:   0 = < 25, 1 = [25, 40], 2 = (40, 70], 3 = > 70
+    """
+    # force_credit_spread: always credit regardless of IV rank — check first
+    if preference == "force_credit_spread":
+        if is_long:
+            return OptionsStrategyType.PUT_CREDIT_SPREAD
+        return OptionsStrategyType.CALL_CREDIT_SPREAD
+
+    # IV rank adjustments - override preference when IV conditions are extreme
+    if iv_band == 3 and preference in ("debit_spread", "straddle", "strangle", "long_call", "long_put"):
+        # High IV: don't buy expensive premium, sell it instead
+        if regime is MarketRegime.RANGE_BOUND:
+            return OptionsStrategyType.IRON_CONDOR
+        if is_long:
+            return OptionsStrategyType.PUT_CREDIT_SPREAD
+        return OptionsStrategyType.CALL_CREDIT_SPREAD
+
+    if iv_band == 0 and preference in ("credit_spread", "iron_condor"):
+        # Low IV: premium too cheap to sell, buy it instead
+        if regime is MarketRegime.VOLATILE:
+            return OptionsStrategyType.LONG_STRADDLE if conf_band >= 3 else OptionsStrategyType.LONG_STRANGLE
+        if is_long:
+            return OptionsStrategyType.CALL_DEBIT_SPREAD
+        return OptionsStrategyType.PUT_DEBIT_SPREAD
+
+    # Honor strategy preference when available
+    pref_map = _PREF_MAP_LONG if is_long else _PREF_MAP_SHORT
+    if preference and preference in pref_map:
+        return pref_map[preference]
+
+    # Fallback: regime + confidence based selection
+    if regime is MarketRegime.TRENDING_UP or regime is MarketRegime.TRENDING_DOWN:
+        if conf_band >= 3:
+            return OptionsStrategyType.PUT_CREDIT_SPREAD if is_long else OptionsStrategyType.CALL_CREDIT_SPREAD
+        if conf_band >= 2:
+            return OptionsStrategyType.CALL_DEBIT_SPREAD if is_long else OptionsStrategyType.PUT_DEBIT_SPREAD
+        # Lower confidence trending: naked long option for max leverage
+        return OptionsStrategyType.LONG_CALL if is_long else OptionsStrategyType.LONG_PUT
+
+    if regime is MarketRegime.RANGE_BOUND:
+        if iv_band >= 2:
+            return OptionsStrategyType.IRON_CONDOR
+        # Low IV range-bound: credit spread one side
+        return OptionsStrategyType.PUT_CREDIT_SPREAD if is_long else OptionsStrategyType.CALL_CREDIT_SPREAD
+
+    if regime is MarketRegime.VOLATILE:
+        if conf_band >= 3:
+            return OptionsStrategyType.LONG_STRADDLE
+        if conf_band >= 2:
+            return OptionsStrategyType.LONG_STRANGLE
+        # Lower confidence volatile: directional debit spread
+        return OptionsStrategyType.CALL_DEBIT_SPREAD if is_long else OptionsStrategyType.PUT_DEBIT_SPREAD
+
+    # Absolute fallback
+    if is_long:
+        return OptionsStrategyType.PUT_CREDIT_SPREAD
+    return OptionsStrategyType.CALL_CREDIT_SPREAD
 
 
 class OptionsSelector:
@@ -37,13 +153,15 @@ class OptionsSelector:
         Returns an OptionsOrder with specific legs, or None if no suitable trade.
         """
         confidence = signal.confidence
-        options_pref = signal.metadata.get("options_preference")
+        meta = signal.metadata
+        options_pref = meta.get("options_preference")
 
         # Extract per-signal overrides (theta_decay and similar strategies set these)
-        target_delta = signal.metadata.get("target_delta", settings.target_delta_short)
-        fallback_delta = signal.metadata.get("fallback_delta", target_delta)
-        preferred_dte = signal.metadata.get("preferred_dte")   # None = use defaults
-        min_dte = signal.metadata.get("min_dte")               # None = use settings default
+        target_delta = meta.get("target_delta", settings.target_delta_short)
+        fallback_delta = meta.get("fallback_delta", target_delta)
+        preferred_dte = meta.get("preferred_dte")   # None = use defaults
+        min_dte = meta.get("min_dte")               # None = use settings default
+        spread_width = settings.default_spread_width
 
         # Determine strategy type based on confidence + regime + preference + IV
         iv_rank = chain.iv_rank if chain.iv_rank is not None else 50.0
@@ -67,7 +185,7 @@ class OptionsSelector:
         order = self._build_order(
             strategy_type, signal, chain, expiration, capital, risk_fraction,
             target_delta=target_delta, fallback_delta=fallback_delta,
-            vix_daily_move_pct=vix_daily_move_pct,
+            vix_daily_move_pct=vix_daily_move_pct, spread_width=spread_width,
         )
         return order
 
@@ -79,85 +197,20 @@ class OptionsSelector:
         preference: Optional[str],
         iv_rank: float = 50.0,
     ) -> Optional[OptionsStrategyType]:
-        """Select options strategy type using preference, IV rank, regime, and confidence."""
+        """Select options strategy type using preference, IV rank, regime, and confidence.
+
+        The tree only depends on which side of its thresholds confidence and
+        IV rank fall, so those are bucketed and the result is memoized.
+        """
 
         if confidence < 0.55:
             return None
 
-        # force_credit_spread: always credit regardless of IV rank — check first
-        if preference == "force_credit_spread":
-            if direction == Direction.LONG:
-                return OptionsStrategyType.PUT_CREDIT_SPREAD
-            return OptionsStrategyType.CALL_CREDIT_SPREAD
-
-        # Map preference string to strategy type
-        pref_map = {
-            "credit_spread": (
-                OptionsStrategyType.PUT_CREDIT_SPREAD if direction == Direction.LONG
-                else OptionsStrategyType.CALL_CREDIT_SPREAD
-            ),
-            "debit_spread": (
-                OptionsStrategyType.CALL_DEBIT_SPREAD if direction == Direction.LONG
-                else OptionsStrategyType.PUT_DEBIT_SPREAD
-            ),
-            "iron_condor": OptionsStrategyType.IRON_CONDOR,
-            "straddle": OptionsStrategyType.LONG_STRADDLE,
-            "strangle": OptionsStrategyType.LONG_STRANGLE,
-            "long_call": OptionsStrategyType.LONG_CALL,
-            "long_put": OptionsStrategyType.LONG_PUT,
-            # Strategy-specific explicit preferences (map directly, bypass IV-rank fallback)
-            "zero_dte_bull_put": OptionsStrategyType.PUT_CREDIT_SPREAD,
-        }
-
-        # IV rank adjustments - override preference when IV conditions are extreme
-        if iv_rank > 70 and preference in ("debit_spread", "straddle", "strangle", "long_call", "long_put"):
-            # High IV: don't buy expensive premium, sell it instead
-            if regime == MarketRegime.RANGE_BOUND:
-                return OptionsStrategyType.IRON_CONDOR
-            if direction == Direction.LONG:
-                return OptionsStrategyType.PUT_CREDIT_SPREAD
-            return OptionsStrategyType.CALL_CREDIT_SPREAD
-
-        if iv_rank < 25 and preference in ("credit_spread", "iron_condor"):
-            # Low IV: premium too cheap to sell, buy it instead
-            if regime == MarketRegime.VOLATILE:
-                return OptionsStrategyType.LONG_STRADDLE if confidence >= 0.75 else OptionsStrategyType.LONG_STRANGLE
-            if direction == Direction.LONG:
-                return OptionsStrategyType.CALL_DEBIT_SPREAD
-            return OptionsStrategyType.PUT_DEBIT_SPREAD
-
-        # Honor strategy preference when available
-        if preference and preference in pref_map:
-            selected = pref_map[preference]
-            return selected
-
-        # Fallback: regime + confidence based selection
-        if regime in (MarketRegime.TRENDING_UP, MarketRegime.TRENDING_DOWN):
-            if confidence >= 0.75:
-                return OptionsStrategyType.PUT_CREDIT_SPREAD if direction == Direction.LONG else OptionsStrategyType.CALL_CREDIT_SPREAD
-            if confidence >= 0.65:
-                return OptionsStrategyType.CALL_DEBIT_SPREAD if direction == Direction.LONG else OptionsStrategyType.PUT_DEBIT_SPREAD
-            # Lower confidence trending: naked long option for max leverage
-            return OptionsStrategyType.LONG_CALL if direction == Direction.LONG else OptionsStrategyType.LONG_PUT
-
-        if regime == MarketRegime.RANGE_BOUND:
-            if iv_rank > 40:
-                return OptionsStrategyType.IRON_CONDOR
-            # Low IV range-bound: credit spread one side
-            return OptionsStrategyType.PUT_CREDIT_SPREAD if direction == Direction.LONG else OptionsStrategyType.CALL_CREDIT_SPREAD
-
-        if regime == MarketRegime.VOLATILE:
-            if confidence >= 0.75:
-                return OptionsStrategyType.LONG_STRADDLE
-            if confidence >= 0.65:
-                return OptionsStrategyType.LONG_STRANGLE
-            # Lower confidence volatile: directional debit spread
-            return OptionsStrategyType.CALL_DEBIT_SPREAD if direction == Direction.LONG else OptionsStrategyType.PUT_DEBIT_SPREAD
-
-        # Absolute fallback
-        if direction == Direction.LONG:
-            return OptionsStrategyType.PUT_CREDIT_SPREAD
-        return OptionsStrategyType.CALL_CREDIT_SPREAD
+        conf_band = 3 if confidence >= 0.75 else 2 if confidence >= 0.65 else 1
+        iv_band = 3 if iv_rank > 70 else 2 if iv_rank > 40 else 0 if iv_rank < 25 else 1
+        return _select_strategy_cached(
+            direction is Direction.LONG, conf_band, regime, preference, iv_band,
+        )
 
     def _select_expiration(
         self,
@@ -175,37 +228,25 @@ class OptionsSelector:
         if not chain.expirations:
             return None
 
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-        today = datetime.now(ZoneInfo("America/New_York")).date()
+        today = datetime.now(ET).date()
 
         # Credit spreads prefer 7-14 DTE, debit prefer 5-10 DTE
-        is_credit = strategy_type in (
-            OptionsStrategyType.PUT_CREDIT_SPREAD,
-            OptionsStrategyType.CALL_CREDIT_SPREAD,
-            OptionsStrategyType.IRON_CONDOR,
-        )
+        is_credit = strategy_type in _CREDIT_STRATEGIES
 
         min_dte_floor = min_dte_override if min_dte_override is not None else max(1, settings.preferred_dte_min)
         ideal_dte = ideal_dte_override if ideal_dte_override is not None else (10 if is_credit else 7)
 
-        best_exp = None
-        best_diff = float("inf")
-
+        candidates = []
         for exp_str in chain.expirations:
             try:
-                exp_date = datetime.strptime(exp_str, "%Y-%m-%d").date()
-                dte = (exp_date - today).days
-                if dte < min_dte_floor:
-                    continue
-                diff = abs(dte - ideal_dte)
-                if diff < best_diff:
-                    best_diff = diff
-                    best_exp = exp_str
+                dte = _dte(exp_str, today)
             except ValueError:
                 continue
+            if dte >= min_dte_floor:
+                candidates.append((abs(dte - ideal_dte), exp_str))
 
-        return best_exp
+        # min() keeps the first of equally distant expirations
+        return min(candidates, key=itemgetter(0))[1] if candidates else None
 
     def _build_order(
         self,
@@ -218,90 +259,59 @@ class OptionsSelector:
         target_delta: Optional[float] = None,
         fallback_delta: Optional[float] = None,
         vix_daily_move_pct: float = 1.25,
+        spread_width: Optional[float] = None,
     ) -> Optional[OptionsOrder]:
         """Build the complete OptionsOrder with legs."""
         price = chain.underlying_price
-        spread_width = settings.default_spread_width
+        if spread_width is None:
+            spread_width = settings.default_spread_width
         if target_delta is None:
             target_delta = settings.target_delta_short
         if fallback_delta is None:
             fallback_delta = target_delta
+        risk_amount = capital * risk_fraction
 
-        if strategy_type == OptionsStrategyType.PUT_CREDIT_SPREAD:
-            return self._build_put_credit_spread(
-                chain, expiration, price, spread_width, target_delta, fallback_delta,
-                signal, capital, risk_fraction, vix_daily_move_pct=vix_daily_move_pct,
-            )
-        elif strategy_type == OptionsStrategyType.CALL_CREDIT_SPREAD:
-            return self._build_call_credit_spread(
-                chain, expiration, price, spread_width, target_delta, fallback_delta,
-                signal, capital, risk_fraction, vix_daily_move_pct=vix_daily_move_pct,
-            )
-        elif strategy_type == OptionsStrategyType.CALL_DEBIT_SPREAD:
-            return self._build_call_debit_spread(
-                chain, expiration, price, spread_width,
-                signal, capital, risk_fraction,
-            )
-        elif strategy_type == OptionsStrategyType.PUT_DEBIT_SPREAD:
-            return self._build_put_debit_spread(
-                chain, expiration, price, spread_width,
-                signal, capital, risk_fraction,
-            )
-        elif strategy_type == OptionsStrategyType.IRON_CONDOR:
-            return self._build_iron_condor(
-                chain, expiration, price, spread_width, target_delta,
-                signal, capital, risk_fraction, vix_daily_move_pct=vix_daily_move_pct,
-            )
-        elif strategy_type == OptionsStrategyType.LONG_STRADDLE:
-            return self._build_long_straddle(
-                chain, expiration, price,
-                signal, capital, risk_fraction,
-            )
-        elif strategy_type == OptionsStrategyType.LONG_STRANGLE:
-            return self._build_long_strangle(
-                chain, expiration, price,
-                signal, capital, risk_fraction,
-            )
-        elif strategy_type == OptionsStrategyType.LONG_CALL:
-            return self._build_long_option(
-                chain, expiration, price, OptionType.CALL,
-                signal, capital, risk_fraction,
-            )
-        elif strategy_type == OptionsStrategyType.LONG_PUT:
-            return self._build_long_option(
-                chain, expiration, price, OptionType.PUT,
-                signal, capital, risk_fraction,
-            )
-        return None
+        builder = self._BUILDERS.get(strategy_type)
+        if builder is None:
+            return None
+        return builder(
+            self, chain, expiration, price, spread_width, target_delta, fallback_delta,
+            signal, capital, risk_amount, vix_daily_move_pct,
+        )
 
     def _find_strike_by_delta(
         self, chain: OptionChainSnapshot, expiration: str,
         option_type: OptionType, target_delta: float,
     ) -> Optional[float]:
         """Find the strike closest to the target delta."""
-        options = chain.calls if option_type == OptionType.CALL else chain.puts
-        best_strike = None
-        best_diff = float("inf")
-
-        for (exp, strike), leg in options.items():
-            if exp != expiration:
-                continue
-            diff = abs(abs(leg.delta) - target_delta)
-            if diff < best_diff:
-                best_diff = diff
-                best_strike = strike
-
-        return best_strike
+        deltas, order, strikes = chain.delta_index(expiration, option_type)
+        if not deltas:
+            return None
+
+        # Candidates: first leg at/above the target and first leg of the
+        # |delta| group just below it; ties go to the earlier chain entry
+        i = bisect.bisect_left(deltas, target_delta)
+        best = i if i < len(deltas) else None
+        if i > 0:
+            j = bisect.bisect_left(deltas, deltas[i - 1])
+            if best is None:
+                best = j
+            else:
+                diff_j = abs(deltas[j] - target_delta)
+                diff_best = abs(deltas[best] - target_delta)
+                if diff_j < diff_best or (diff_j == diff_best and order[j] < order[best]):
+                    best = j
+
+        return strikes[best]
 
     def _find_atm_strike(
         self, chain: OptionChainSnapshot, expiration: str,
     ) -> Optional[float]:
         """Find the strike closest to ATM."""
-        strikes = chain.strikes_for_expiration(expiration)
-        if not strikes:
+        strikes = chain.strike_array(expiration)
+        if strikes.size == 0:
             return None
-        price = chain.underlying_price
-        return min(strikes, key=lambda s: abs(s - price))
+        return float(strikes[np.abs(strikes - chain.underlying_price).argmin()])
 
     def _find_sigma_strike_otm(
         self,
@@ -320,167 +330,104 @@ class OptionsSelector:
         so they are always 'selling outside the expected move'.
         Returns None if no strike exists at or beyond that distance.
         """
-        strikes = chain.strikes_for_expiration(expiration)
-        if not strikes:
-            return None
+        strikes = chain.strike_array(expiration)
 
-        if option_type == OptionType.PUT:
+        if option_type is OptionType.PUT:
             threshold = underlying_price - sigma_distance
-            candidates = [s for s in strikes if s <= threshold]
-            return max(candidates) if candidates else None  # highest strike still OTM enough
+            i = int(np.searchsorted(strikes, threshold, side="right"))
+            return float(strikes[i - 1]) if i > 0 else None  # highest strike still OTM enough
 
         # CALL
         threshold = underlying_price + sigma_distance
-        candidates = [s for s in strikes if s >= threshold]
-        return min(candidates) if candidates else None  # lowest strike still OTM enough
+        i = int(np.searchsorted(strikes, threshold, side="left"))
+        return float(strikes[i]) if i < strikes.size else None  # lowest strike still OTM enough
 
     def _size_contracts(
-        self, max_loss_per_contract: float, capital: float, risk_fraction: float,
+        self, max_loss_per_contract: float, risk_amount: float,
     ) -> int:
-        """Calculate number of contracts based on defined risk."""
+        """Calculate number of contracts based on defined risk (capital * risk_fraction)."""
         if max_loss_per_contract <= 0:
             return 0
-        risk_amount = capital * risk_fraction
         contracts = int(risk_amount / max_loss_per_contract)
         return max(1, min(contracts, settings.max_contracts_per_trade))
 
-    def _build_put_credit_spread(
-        self, chain, expiration, price, spread_width, target_delta, fallback_delta,
-        signal, capital, risk_fraction, vix_daily_move_pct: float = 1.25,
-    ) -> Optional[OptionsOrder]:
-        """Sell higher put, buy lower put.
-
-        VIX/16 rule: short leg is placed at the farther-OTM of (delta-based strike,
-        1σ minimum distance strike). Expert credit traders never sell inside the
-        expected move.
-        """
-        short_strike = self._find_strike_by_delta(chain, expiration, OptionType.PUT, target_delta)
-        if short_strike is None and fallback_delta != target_delta:
-            short_strike = self._find_strike_by_delta(chain, expiration, OptionType.PUT, fallback_delta)
-            logger.debug(f"put_credit_spread: fell back to delta {fallback_delta} for short strike")
-        if short_strike is None:
-            return None
-
-        # VIX/16: enforce short leg is at least 1σ below current price.
-        # If delta-based strike is too close to ATM, move it out to the sigma threshold.
-        one_sigma_pts = price * (vix_daily_move_pct / 100.0)
-        sigma_strike = self._find_sigma_strike_otm(
-            chain, expiration, OptionType.PUT, price, one_sigma_pts
-        )
-        if sigma_strike is not None and short_strike > sigma_strike:
-            logger.debug(
-                f"put_credit_spread: VIX/16 moved short strike {short_strike}→{sigma_strike} "
-                f"(1σ={one_sigma_pts:.1f}pt, vix_move={vix_daily_move_pct:.2f}%)"
-            )
-            short_strike = sigma_strike
-
-        long_strike = short_strike - spread_width
-        short_leg_data = chain.get_put(expiration, short_strike)
-        long_leg_data = chain.get_put(expiration, long_strike)
-
-        if not short_leg_data or not long_leg_data:
-            return None
-
-        credit = short_leg_data.premium - long_leg_data.premium
-        if credit <= 0:
-            return None
-
-        max_loss_per = (spread_width - credit) * 100
-        max_profit_per = credit * 100
-
-        # Minimum credit gate: reject if credit is too thin relative to max loss
-        if max_profit_per < 25.0:
-            logger.debug(
-                f"Rejecting put_credit_spread: credit=${credit:.2f} too thin (max_profit=${max_profit_per:.0f})"
-            )
-            return None
-
-        # Theta-decay sizing: target weekly credit, capped at 40% of capital
-        if signal.metadata.get("options_preference") == "force_credit_spread":
-            target_contracts = ceil(settings.weekly_credit_target / (credit * 100))
-            capital_cap = int(capital * 0.40 / max_loss_per) if max_loss_per > 0 else 1
-            contracts = max(1, min(target_contracts, capital_cap, settings.max_contracts_per_trade_theta))
-        else:
-            contracts = self._size_contracts(max_loss_per, capital, risk_fraction)
-
-        short_leg = OptionLeg(
-            contract_symbol=short_leg_data.contract_symbol,
-            option_type=OptionType.PUT,
-            strike=short_strike,
-            expiration=expiration,
-            action=OptionAction.SELL_TO_OPEN,
-            quantity=contracts,
-            premium=short_leg_data.premium,
-            delta=short_leg_data.delta,
-            gamma=short_leg_data.gamma,
-            theta=short_leg_data.theta,
-            vega=short_leg_data.vega,
-            iv=short_leg_data.iv,
+    @staticmethod
+    def _make_leg(
+        data: OptionLeg, option_type: OptionType, strike: float,
+        expiration: str, action: OptionAction, contracts: int,
+    ) -> OptionLeg:
+        """Copy chain leg data into an order leg with the given action/quantity."""
+        return OptionLeg(
+            data.contract_symbol, option_type, strike, expiration, action, contracts,
+            data.premium, data.delta, data.gamma, data.theta, data.vega, data.iv,
         )
-        long_leg = OptionLeg(
-            contract_symbol=long_leg_data.contract_symbol,
-            option_type=OptionType.PUT,
-            strike=long_strike,
-            expiration=expiration,
-            action=OptionAction.BUY_TO_OPEN,
-            quantity=contracts,
-            premium=long_leg_data.premium,
-            delta=long_leg_data.delta,
-            gamma=long_leg_data.gamma,
-            theta=long_leg_data.theta,
-            vega=long_leg_data.vega,
-            iv=long_leg_data.iv,
-        )
-
-        net_delta = (short_leg_data.delta + long_leg_data.delta) * contracts
-        net_theta = (short_leg_data.theta + long_leg_data.theta) * contracts
 
+    def _vertical_order(
+        self, strategy_type: OptionsStrategyType, option_type: OptionType,
+        expiration: str, price: float, signal: TradeSignal,
+        first_strike: float, first_data: OptionLeg, first_action: OptionAction,
+        second_strike: float, second_data: OptionLeg, second_action: OptionAction,
+        contracts: int, net_premium: float, max_loss_per: float, max_profit_per: float,
+    ) -> OptionsOrder:
+        """Assemble a two-leg vertical spread order."""
+        legs = [
+            self._make_leg(first_data, option_type, first_strike, expiration, first_action, contracts),
+            self._make_leg(second_data, option_type, second_strike, expiration, second_action, contracts),
+        ]
         return OptionsOrder(
-            strategy_type=OptionsStrategyType.PUT_CREDIT_SPREAD,
-            legs=[short_leg, long_leg],
+            strategy_type=strategy_type,
+            legs=legs,
             underlying_price=price,
-            net_premium=-credit,  # negative = credit received
+            net_premium=net_premium,
             max_loss=max_loss_per * contracts,
             max_profit=max_profit_per * contracts,
             contracts=contracts,
-            net_delta=net_delta,
-            net_theta=net_theta,
+            net_delta=(first_data.delta + second_data.delta) * contracts,
+            net_theta=(first_data.theta + second_data.theta) * contracts,
             signal_strategy=signal.strategy,
-            regime="",
             confidence=signal.confidence,
         )
 
-    def _build_call_credit_spread(
-        self, chain, expiration, price, spread_width, target_delta, fallback_delta,
-        signal, capital, risk_fraction, vix_daily_move_pct: float = 1.25,
+    def _build_credit_vertical(
+        self, option_type: OptionType, chain, expiration, price, spread_width,
+        target_delta, fallback_delta, signal, capital, risk_amount,
+        vix_daily_move_pct: float = 1.25,
     ) -> Optional[OptionsOrder]:
-        """Sell lower call, buy higher call.
+        """Sell the delta-targeted strike, buy one spread width further OTM.
 
         VIX/16 rule: short leg is placed at the farther-OTM of (delta-based strike,
-        1σ minimum distance strike).
+        1σ minimum distance strike). Expert credit traders never sell inside the
+        expected move.
         """
-        short_strike = self._find_strike_by_delta(chain, expiration, OptionType.CALL, target_delta)
+        is_put = option_type is OptionType.PUT
+        name = "put_credit_spread" if is_put else "call_credit_spread"
+
+        short_strike = self._find_strike_by_delta(chain, expiration, option_type, target_delta)
         if short_strike is None and fallback_delta != target_delta:
-            short_strike = self._find_strike_by_delta(chain, expiration, OptionType.CALL, fallback_delta)
-            logger.debug(f"call_credit_spread: fell back to delta {fallback_delta} for short strike")
+            short_strike = self._find_strike_by_delta(chain, expiration, option_type, fallback_delta)
+            logger.debug(f"{name}: fell back to delta {fallback_delta} for short strike")
         if short_strike is None:
             return None
 
-        # VIX/16: enforce short leg is at least 1σ above current price.
+        # VIX/16: enforce short leg is at least 1σ OTM.
+        # If delta-based strike is too close to ATM, move it out to the sigma threshold.
         one_sigma_pts = price * (vix_daily_move_pct / 100.0)
         sigma_strike = self._find_sigma_strike_otm(
-            chain, expiration, OptionType.CALL, price, one_sigma_pts
+            chain, expiration, option_type, price, one_sigma_pts
         )
-        if sigma_strike is not None and short_strike < sigma_strike:
+        if sigma_strike is not None and (
+            short_strike > sigma_strike if is_put else short_strike < sigma_strike
+        ):
             logger.debug(
-                f"call_credit_spread: VIX/16 moved short strike {short_strike}→{sigma_strike} "
+                f"{name}: VIX/16 moved short strike {short_strike}→{sigma_strike} "
                 f"(1σ={one_sigma_pts:.1f}pt, vix_move={vix_daily_move_pct:.2f}%)"
             )
             short_strike = sigma_strike
 
-        long_strike = short_strike + spread_width
-        short_leg_data = chain.get_call(expiration, short_strike)
-        long_leg_data = chain.get_call(expiration, long_strike)
+        long_strike = short_strike - spread_width if is_put else short_strike + spread_width
+        get_leg = chain.get_put if is_put else chain.get_call
+        short_leg_data = get_leg(expiration, short_strike)
+        long_leg_data = get_leg(expiration, long_strike)
 
         if not short_leg_data or not long_leg_data:
             return None
@@ -492,10 +439,10 @@ class OptionsSelector:
         max_loss_per = (spread_width - credit) * 100
         max_profit_per = credit * 100
 
-        # Minimum credit gate
+        # Minimum credit gate: reject if credit is too thin relative to max loss
         if max_profit_per < 25.0:
             logger.debug(
-                f"Rejecting call_credit_spread: credit=${credit:.2f} too thin (max_profit=${max_profit_per:.0f})"
+                f"Rejecting {name}: credit=${credit:.2f} too thin (max_profit=${max_profit_per:.0f})"
             )
             return None
 
@@ -505,66 +452,32 @@ class OptionsSelector:
             capital_cap = int(capital * 0.40 / max_loss_per) if max_loss_per > 0 else 1
             contracts = max(1, min(target_contracts, capital_cap, settings.max_contracts_per_trade_theta))
         else:
-            contracts = self._size_contracts(max_loss_per, capital, risk_fraction)
-
-        short_leg = OptionLeg(
-            contract_symbol=short_leg_data.contract_symbol,
-            option_type=OptionType.CALL,
-            strike=short_strike,
-            expiration=expiration,
-            action=OptionAction.SELL_TO_OPEN,
-            quantity=contracts,
-            premium=short_leg_data.premium,
-            delta=short_leg_data.delta,
-            gamma=short_leg_data.gamma,
-            theta=short_leg_data.theta,
-            vega=short_leg_data.vega,
-            iv=short_leg_data.iv,
-        )
-        long_leg = OptionLeg(
-            contract_symbol=long_leg_data.contract_symbol,
-            option_type=OptionType.CALL,
-            strike=long_strike,
-            expiration=expiration,
-            action=OptionAction.BUY_TO_OPEN,
-            quantity=contracts,
-            premium=long_leg_data.premium,
-            delta=long_leg_data.delta,
-            gamma=long_leg_data.gamma,
-            theta=long_leg_data.theta,
-            vega=long_leg_data.vega,
-            iv=long_leg_data.iv,
+            contracts = self._size_contracts(max_loss_per, risk_amount)
+
+        return self._vertical_order(
+            OptionsStrategyType.PUT_CREDIT_SPREAD if is_put else OptionsStrategyType.CALL_CREDIT_SPREAD,
+            option_type, expiration, price, signal,
+            short_strike, short_leg_data, OptionAction.SELL_TO_OPEN,
+            long_strike, long_leg_data, OptionAction.BUY_TO_OPEN,
+            contracts, -credit, max_loss_per, max_profit_per,  # negative = credit received
         )
 
-        net_delta = (short_leg_data.delta + long_leg_data.delta) * contracts
-        net_theta = (short_leg_data.theta + long_leg_data.theta) * contracts
-
-        return OptionsOrder(
-            strategy_type=OptionsStrategyType.CALL_CREDIT_SPREAD,
-            legs=[short_leg, long_leg],
-            underlying_price=price,
-            net_premium=-credit,
-            max_loss=max_loss_per * contracts,
-            max_profit=max_profit_per * contracts,
-            contracts=contracts,
-            net_delta=net_delta,
-            net_theta=net_theta,
-            signal_strategy=signal.strategy,
-            confidence=signal.confidence,
-        )
-
-    def _build_call_debit_spread(
-        self, chain, expiration, price, spread_width,
-        signal, capital, risk_fraction,
+    def _build_debit_vertical(
+        self, option_type: OptionType, chain, expiration, price, spread_width,
+        signal, risk_amount,
     ) -> Optional[OptionsOrder]:
-        """Buy ATM call, sell OTM call."""
+        """Buy the ATM strike, sell one spread width OTM."""
+        is_put = option_type is OptionType.PUT
+        name = "put_debit_spread" if is_put else "call_debit_spread"
+
         long_strike = self._find_atm_strike(chain, expiration)
         if long_strike is None:
             return None
 
-        short_strike = long_strike + spread_width
-        long_leg_data = chain.get_call(expiration, long_strike)
-        short_leg_data = chain.get_call(expiration, short_strike)
+        short_strike = long_strike - spread_width if is_put else long_strike + spread_width
+        get_leg = chain.get_put if is_put else chain.get_call
+        long_leg_data = get_leg(expiration, long_strike)
+        short_leg_data = get_leg(expiration, short_strike)
 
         if not long_leg_data or not short_leg_data:
             return None
@@ -579,141 +492,70 @@ class OptionsSelector:
         # Hard R:R gate: debit must not exceed half the spread width (R:R ≥ 1:1)
         if max_profit_per < max_loss_per:
             logger.debug(
-                f"Rejecting call_debit_spread: R:R={max_profit_per:.0f}/{max_loss_per:.0f} "
+                f"Rejecting {name}: R:R={max_profit_per:.0f}/{max_loss_per:.0f} "
                 f"(debit=${debit:.2f}, width=${spread_width})"
             )
             return None
         # Minimum profit gate: avoid trades with trivial upside
         if max_profit_per < 50.0:
             logger.debug(
-                f"Rejecting call_debit_spread: max_profit_per=${max_profit_per:.0f} < $50 minimum"
+                f"Rejecting {name}: max_profit_per=${max_profit_per:.0f} < $50 minimum"
             )
             return None
 
-        contracts = self._size_contracts(max_loss_per, capital, risk_fraction)
-
-        long_leg = OptionLeg(
-            contract_symbol=long_leg_data.contract_symbol,
-            option_type=OptionType.CALL,
-            strike=long_strike,
-            expiration=expiration,
-            action=OptionAction.BUY_TO_OPEN,
-            quantity=contracts,
-            premium=long_leg_data.premium,
-            delta=long_leg_data.delta, gamma=long_leg_data.gamma,
-            theta=long_leg_data.theta, vega=long_leg_data.vega, iv=long_leg_data.iv,
+        contracts = self._size_contracts(max_loss_per, risk_amount)
+
+        return self._vertical_order(
+            OptionsStrategyType.PUT_DEBIT_SPREAD if is_put else OptionsStrategyType.CALL_DEBIT_SPREAD,
+            option_type, expiration, price, signal,
+            long_strike, long_leg_data, OptionAction.BUY_TO_OPEN,
+            short_strike, short_leg_data, OptionAction.SELL_TO_OPEN,
+            contracts, debit, max_loss_per, max_profit_per,
         )
-        short_leg = OptionLeg(
-            contract_symbol=short_leg_data.contract_symbol,
-            option_type=OptionType.CALL,
-            strike=short_strike,
-            expiration=expiration,
-            action=OptionAction.SELL_TO_OPEN,
-            quantity=contracts,
-            premium=short_leg_data.premium,
-            delta=short_leg_data.delta, gamma=short_leg_data.gamma,
-            theta=short_leg_data.theta, vega=short_leg_data.vega, iv=short_leg_data.iv,
+
+    def _build_put_credit_spread(
+        self, chain, expiration, price, spread_width, target_delta, fallback_delta,
+        signal, capital, risk_amount, vix_daily_move_pct: float = 1.25,
+    ) -> Optional[OptionsOrder]:
+        """Sell higher put, buy lower put."""
+        return self._build_credit_vertical(
+            OptionType.PUT, chain, expiration, price, spread_width, target_delta,
+            fallback_delta, signal, capital, risk_amount, vix_daily_move_pct,
         )
 
-        net_delta = (long_leg_data.delta + short_leg_data.delta) * contracts
-        net_theta = (long_leg_data.theta + short_leg_data.theta) * contracts
+    def _build_call_credit_spread(
+        self, chain, expiration, price, spread_width, target_delta, fallback_delta,
+        signal, capital, risk_amount, vix_daily_move_pct: float = 1.25,
+    ) -> Optional[OptionsOrder]:
+        """Sell lower call, buy higher call."""
+        return self._build_credit_vertical(
+            OptionType.CALL, chain, expiration, price, spread_width, target_delta,
+            fallback_delta, signal, capital, risk_amount, vix_daily_move_pct,
+        )
 
-        return OptionsOrder(
-            strategy_type=OptionsStrategyType.CALL_DEBIT_SPREAD,
-            legs=[long_leg, short_leg],
-            underlying_price=price,
-            net_premium=debit,
-            max_loss=max_loss_per * contracts,
-            max_profit=max_profit_per * contracts,
-            contracts=contracts,
-            net_delta=net_delta,
-            net_theta=net_theta,
-            signal_strategy=signal.strategy,
-            confidence=signal.confidence,
+    def _build_call_debit_spread(
+        self, chain, expiration, price, spread_width, target_delta, fallback_delta,
+        signal, capital, risk_amount, vix_daily_move_pct: float = 1.25,
+    ) -> Optional[OptionsOrder]:
+        """Buy ATM call, sell OTM call."""
+        return self._build_debit_vertical(
+            OptionType.CALL, chain, expiration, price, spread_width,
+            signal, risk_amount,
         )
 
     def _build_put_debit_spread(
-        self, chain, expiration, price, spread_width,
-        signal, capital, risk_fraction,
+        self, chain, expiration, price, spread_width, target_delta, fallback_delta,
+        signal, capital, risk_amount, vix_daily_move_pct: float = 1.25,
     ) -> Optional[OptionsOrder]:
         """Buy ATM put, sell OTM put."""
-        long_strike = self._find_atm_strike(chain, expiration)
-        if long_strike is None:
-            return None
-
-        short_strike = long_strike - spread_width
-        long_leg_data = chain.get_put(expiration, long_strike)
-        short_leg_data = chain.get_put(expiration, short_strike)
-
-        if not long_leg_data or not short_leg_data:
-            return None
-
-        debit = long_leg_data.premium - short_leg_data.premium
-        if debit <= 0:
-            return None
-
-        max_loss_per = debit * 100
-        max_profit_per = (spread_width - debit) * 100
-
-        # Hard R:R gate: debit must not exceed half the spread width (R:R ≥ 1:1)
-        if max_profit_per < max_loss_per:
-            logger.debug(
-                f"Rejecting put_debit_spread: R:R={max_profit_per:.0f}/{max_loss_per:.0f} "
-                f"(debit=${debit:.2f}, width=${spread_width})"
-            )
-            return None
-        # Minimum profit gate
-        if max_profit_per < 50.0:
-            logger.debug(
-                f"Rejecting put_debit_spread: max_profit_per=${max_profit_per:.0f} < $50 minimum"
-            )
-            return None
-
-        contracts = self._size_contracts(max_loss_per, capital, risk_fraction)
-
-        long_leg = OptionLeg(
-            contract_symbol=long_leg_data.contract_symbol,
-            option_type=OptionType.PUT,
-            strike=long_strike,
-            expiration=expiration,
-            action=OptionAction.BUY_TO_OPEN,
-            quantity=contracts,
-            premium=long_leg_data.premium,
-            delta=long_leg_data.delta, gamma=long_leg_data.gamma,
-            theta=long_leg_data.theta, vega=long_leg_data.vega, iv=long_leg_data.iv,
-        )
-        short_leg = OptionLeg(
-            contract_symbol=short_leg_data.contract_symbol,
-            option_type=OptionType.PUT,
-            strike=short_strike,
-            expiration=expiration,
-            action=OptionAction.SELL_TO_OPEN,
-            quantity=contracts,
-            premium=short_leg_data.premium,
-            delta=short_leg_data.delta, gamma=short_leg_data.gamma,
-            theta=short_leg_data.theta, vega=short_leg_data.vega, iv=short_leg_data.iv,
-        )
-
-        net_delta = (long_leg_data.delta + short_leg_data.delta) * contracts
-        net_theta = (long_leg_data.theta + short_leg_data.theta) * contracts
-
-        return OptionsOrder(
-            strategy_type=OptionsStrategyType.PUT_DEBIT_SPREAD,
-            legs=[long_leg, short_leg],
-            underlying_price=price,
-            net_premium=debit,
-            max_loss=max_loss_per * contracts,
-            max_profit=max_profit_per * contracts,
-            contracts=contracts,
-            net_delta=net_delta,
-            net_theta=net_theta,
-            signal_strategy=signal.strategy,
-            confidence=signal.confidence,
+        return self._build_debit_vertical(
+            OptionType.PUT, chain, expiration, price, spread_width,
+            signal, risk_amount,
         )
 
     def _build_iron_condor(
-        self, chain, expiration, price, spread_width, target_delta,
-        signal, capital, risk_fraction, vix_daily_move_pct: float = 1.25,
+        self, chain, expiration, price, spread_width, target_delta, fallback_delta,
+        signal, capital, risk_amount, vix_daily_move_pct: float = 1.25,
     ) -> Optional[OptionsOrder]:
         """Put credit spread + call credit spread.
 
@@ -768,25 +610,18 @@ class OptionsSelector:
 
         max_loss_per = (spread_width - total_credit) * 100
         max_profit_per = total_credit * 100
-        contracts = self._size_contracts(max_loss_per, capital, risk_fraction)
+        contracts = self._size_contracts(max_loss_per, risk_amount)
 
+        make_leg = self._make_leg
         legs = [
-            OptionLeg(ps.contract_symbol, OptionType.PUT, put_short, expiration,
-                      OptionAction.SELL_TO_OPEN, contracts, ps.premium,
-                      ps.delta, ps.gamma, ps.theta, ps.vega, ps.iv),
-            OptionLeg(pl.contract_symbol, OptionType.PUT, put_long, expiration,
-                      OptionAction.BUY_TO_OPEN, contracts, pl.premium,
-                      pl.delta, pl.gamma, pl.theta, pl.vega, pl.iv),
-            OptionLeg(cs.contract_symbol, OptionType.CALL, call_short, expiration,
-                      OptionAction.SELL_TO_OPEN, contracts, cs.premium,
-                      cs.delta, cs.gamma, cs.theta, cs.vega, cs.iv),
-            OptionLeg(cl.contract_symbol, OptionType.CALL, call_long, expiration,
-                      OptionAction.BUY_TO_OPEN, contracts, cl.premium,
-                      cl.delta, cl.gamma, cl.theta, cl.vega, cl.iv),
+            make_leg(ps, OptionType.PUT, put_short, expiration, OptionAction.SELL_TO_OPEN, contracts),
+            make_leg(pl, OptionType.PUT, put_long, expiration, OptionAction.BUY_TO_OPEN, contracts),
+            make_leg(cs, OptionType.CALL, call_short, expiration, OptionAction.SELL_TO_OPEN, contracts),
+            make_leg(cl, OptionType.CALL, call_long, expiration, OptionAction.BUY_TO_OPEN, contracts),
         ]
 
-        net_delta = sum(l.delta for l in [ps, pl, cs, cl]) * contracts
-        net_theta = sum(l.theta for l in [ps, pl, cs, cl]) * contracts
+        net_delta = (ps.delta + pl.delta + cs.delta + cl.delta) * contracts
+        net_theta = (ps.theta + pl.theta + cs.theta + cl.theta) * contracts
 
         return OptionsOrder(
             strategy_type=OptionsStrategyType.IRON_CONDOR,
@@ -803,7 +638,8 @@ class OptionsSelector:
         )
 
     def _build_long_straddle(
-        self, chain, expiration, price, signal, capital, risk_fraction,
+        self, chain, expiration, price, spread_width, target_delta, fallback_delta,
+        signal, capital, risk_amount, vix_daily_move_pct: float = 1.25,
     ) -> Optional[OptionsOrder]:
         """Buy ATM call + ATM put."""
         atm = self._find_atm_strike(chain, expiration)
@@ -817,15 +653,11 @@ class OptionsSelector:
 
         total_debit = call.premium + put.premium
         max_loss_per = total_debit * 100
-        contracts = self._size_contracts(max_loss_per, capital, risk_fraction)
+        contracts = self._size_contracts(max_loss_per, risk_amount)
 
         legs = [
-            OptionLeg(call.contract_symbol, OptionType.CALL, atm, expiration,
-                      OptionAction.BUY_TO_OPEN, contracts, call.premium,
-                      call.delta, call.gamma, call.theta, call.vega, call.iv),
-            OptionLeg(put.contract_symbol, OptionType.PUT, atm, expiration,
-                      OptionAction.BUY_TO_OPEN, contracts, put.premium,
-                      put.delta, put.gamma, put.theta, put.vega, put.iv),
+            self._make_leg(call, OptionType.CALL, atm, expiration, OptionAction.BUY_TO_OPEN, contracts),
+            self._make_leg(put, OptionType.PUT, atm, expiration, OptionAction.BUY_TO_OPEN, contracts),
         ]
 
         return OptionsOrder(
@@ -843,7 +675,8 @@ class OptionsSelector:
         )
 
     def _build_long_strangle(
-        self, chain, expiration, price, signal, capital, risk_fraction,
+        self, chain, expiration, price, spread_width, target_delta, fallback_delta,
+        signal, capital, risk_amount, vix_daily_move_pct: float = 1.25,
     ) -> Optional[OptionsOrder]:
         """Buy OTM call + OTM put (delta ~0.25-0.30)."""
         call_strike = self._find_strike_by_delta(chain, expiration, OptionType.CALL, 0.28)
@@ -859,15 +692,11 @@ class OptionsSelector:
 
         total_debit = call.premium + put.premium
         max_loss_per = total_debit * 100
-        contracts = self._size_contracts(max_loss_per, capital, risk_fraction)
+        contracts = self._size_contracts(max_loss_per, risk_amount)
 
         legs = [
-            OptionLeg(call.contract_symbol, OptionType.CALL, call_strike, expiration,
-                      OptionAction.BUY_TO_OPEN, contracts, call.premium,
-                      call.delta, call.gamma, call.theta, call.vega, call.iv),
-            OptionLeg(put.contract_symbol, OptionType.PUT, put_strike, expiration,
-                      OptionAction.BUY_TO_OPEN, contracts, put.premium,
-                      put.delta, put.gamma, put.theta, put.vega, put.iv),
+            self._make_leg(call, OptionType.CALL, call_strike, expiration, OptionAction.BUY_TO_OPEN, contracts),
+            self._make_leg(put, OptionType.PUT, put_strike, expiration, OptionAction.BUY_TO_OPEN, contracts),
         ]
 
         return OptionsOrder(
@@ -884,16 +713,30 @@ class OptionsSelector:
             confidence=signal.confidence,
         )
 
+    def _build_long_call(
+        self, chain, expiration, price, spread_width, target_delta, fallback_delta,
+        signal, capital, risk_amount, vix_daily_move_pct: float = 1.25,
+    ) -> Optional[OptionsOrder]:
+        """Buy a single ATM call."""
+        return self._build_long_option(chain, expiration, price, OptionType.CALL, signal, risk_amount)
+
+    def _build_long_put(
+        self, chain, expiration, price, spread_width, target_delta, fallback_delta,
+        signal, capital, risk_amount, vix_daily_move_pct: float = 1.25,
+    ) -> Optional[OptionsOrder]:
+        """Buy a single ATM put."""
+        return self._build_long_option(chain, expiration, price, OptionType.PUT, signal, risk_amount)
+
     def _build_long_option(
         self, chain, expiration, price, option_type: OptionType,
-        signal, capital, risk_fraction,
+        signal, risk_amount,
     ) -> Optional[OptionsOrder]:
         """Buy a single ATM option."""
         atm = self._find_atm_strike(chain, expiration)
         if atm is None:
             return None
 
-        if option_type == OptionType.CALL:
+        if option_type is OptionType.CALL:
             leg_data = chain.get_call(expiration, atm)
             strat_type = OptionsStrategyType.LONG_CALL
         else:
@@ -904,19 +747,9 @@ class OptionsSelector:
             return None
 
         max_loss_per = leg_data.premium * 100
-        contracts = self._size_contracts(max_loss_per, capital, risk_fraction)
-
-        leg = OptionLeg(
-            contract_symbol=leg_data.contract_symbol,
-            option_type=option_type,
-            strike=atm,
-            expiration=expiration,
-            action=OptionAction.BUY_TO_OPEN,
-            quantity=contracts,
-            premium=leg_data.premium,
-            delta=leg_data.delta, gamma=leg_data.gamma,
-            theta=leg_data.theta, vega=leg_data.vega, iv=leg_data.iv,
-        )
+        contracts = self._size_contracts(max_loss_per, risk_amount)
+
+        leg = self._make_leg(leg_data, option_type, atm, expiration, OptionAction.BUY_TO_OPEN, contracts)
 
         return OptionsOrder(
             strategy_type=strat_type,
@@ -931,3 +764,16 @@ class OptionsSelector:
             signal_strategy=signal.strategy,
             confidence=signal.confidence,
         )
+
+    # Strategy type -> builder; every builder takes the same argument list
+    _BUILDERS = {
+        OptionsStrategyType.PUT_CREDIT_SPREAD: _build_put_credit_spread,
+        OptionsStrategyType.CALL_CREDIT_SPREAD: _build_call_credit_spread,
+        OptionsStrategyType.CALL_DEBIT_SPREAD: _build_call_debit_spread,
+        OptionsStrategyType.PUT_DEBIT_SPREAD: _build_put_debit_spread,
+        OptionsStrategyType.IRON_CONDOR: _build_iron_condor,
+        OptionsStrategyType.LONG_STRADDLE: _build_long_straddle,
+        OptionsStrategyType.LONG_STRANGLE: _build_long_strangle,
+        OptionsStrategyType.LONG_CALL: _build_long_call,
+        OptionsStrategyType.LONG_PUT: _build_long_put,
+    }
@@ -3,6 +3,8 @@
 from __future__ import annotations
 import logging
 
+import numpy as np
+
 from app.config import settings
 from app.services.options.models import OptionsOrder
 
@@ -37,6 +39,11 @@ def calculate_contracts(
     if order.max_loss <= 0 or capital <= 0:
         return 0
 
+    # Snapshot the tunables once per call. Not module constants: the
+    # settings route can change max_drawdown at runtime.
+    max_drawdown = settings.max_drawdown
+    high_confidence_threshold = settings.high_confidence_threshold
+
     # ── Model quality scalar ─────────────────────────────────────────────────
     # As the model proves itself (composite score rises), we risk slightly more.
     # Score=0  → 1.0×, Score=50 → 1.5×, Score=−20 → 0.8× (reduce when struggling)
@@ -50,7 +57,7 @@ def calculate_contracts(
     # Lift from 5 → 10 only when: confidence is very high AND model is validated.
     # blended_score ≥ 15 means the strategy has meaningful backtest + live evidence.
     high_confidence = (
-        confidence >= settings.high_confidence_threshold
+        confidence >= high_confidence_threshold
         and blended_score >= 15
     )
     contract_ceiling = (
@@ -91,47 +98,97 @@ def calculate_contracts(
             f"(vix_move={vix_daily_move_pct:.2f}%)"
         )
 
+    if collateral_per_contract > capital:
+        logger.warning(
+            f"Cannot afford even 1 contract: collateral ${collateral_per_contract:.0f} "
+            f"> capital ${capital:.0f}"
+        )
+        return 0
+
+    # Portfolio risk cap: total open risk must not exceed max_drawdown % of capital.
+    # Use total equity (capital + collateral) for the cap — approximate total equity.
+    portfolio_max = (capital + open_risk) * max_drawdown
+    available_risk = portfolio_max - open_risk
+    if available_risk <= 0:
+        logger.warning(
+            f"Portfolio risk cap reached: open_risk=${open_risk:.0f} >= "
+            f"max=${portfolio_max:.0f}. Skipping trade."
+        )
+        return 0
+
     # Size by risk fraction — scaled up when model quality is high and down when VIX is elevated
     risk_amount = capital * risk_fraction * model_quality_scalar * vix_scalar
-    contracts_by_risk = int(risk_amount / max_loss_per_contract)
-
-    # Size by available capital (can't commit more collateral than we have)
-    contracts_by_capital = int(capital / collateral_per_contract)
-
-    # Take the smaller of risk-based and capital-based sizing
-    contracts = min(contracts_by_risk, contracts_by_capital)
-    contracts = max(1, min(contracts, contract_ceiling))
-
-    # Verify we can actually afford this many contracts
-    total_collateral = collateral_per_contract * contracts
-    if total_collateral > capital:
-        contracts = max(1, int(capital / collateral_per_contract))
-        if collateral_per_contract > capital:
-            logger.warning(
-                f"Cannot afford even 1 contract: collateral ${collateral_per_contract:.0f} "
-                f"> capital ${capital:.0f}"
-            )
-            return 0
-
-    # Portfolio risk cap: total open risk must not exceed max_drawdown % of capital
-    total_risk = open_risk + (max_loss_per_contract * contracts)
-    # Use total equity (capital + collateral) for portfolio risk cap
-    total_equity = capital + open_risk  # approximate total equity
-    portfolio_max = total_equity * settings.max_drawdown
-
-    if total_risk > portfolio_max:
-        available_risk = portfolio_max - open_risk
-        if available_risk <= 0:
-            logger.warning(
-                f"Portfolio risk cap reached: open_risk=${open_risk:.0f} >= "
-                f"max=${portfolio_max:.0f}. Skipping trade."
-            )
-            return 0
-        contracts = max(1, int(available_risk / max_loss_per_contract))
-
-    # Final capital check after all adjustments
-    final_collateral = collateral_per_contract * contracts
-    if final_collateral > capital:
+    contracts = max(1, min(
+        int(risk_amount / max_loss_per_contract),
+        # Can't commit more collateral than we have
+        int(capital / collateral_per_contract),
+        contract_ceiling,
+        # Remaining room under the portfolio risk cap
+        int(available_risk / max_loss_per_contract),
+    ))
+
+    # Final capital check (guards float rounding in the quotients above)
+    if collateral_per_contract * contracts > capital:
         return 0
 
     return contracts
+
+
+def calculate_contracts_batch(
+    max_loss_per_contract: np.ndarray,
+    collateral_per_contract: np.ndarray,
+    capital: np.ndarray,
+    risk_fraction: np.ndarray,
+    open_risk: np.ndarray | float = 0.0,
+    blended_score: np.ndarray | float = 0.0,
+    confidence: np.ndarray | float = 0.0,
+    vix_daily_move_pct: np.ndarray | float = 1.25,
+) -> np.ndarray:
+    """Vectorised calculate_contracts for parameter sweeps.
+
+    Takes per-contract max loss and collateral instead of an OptionsOrder;
+    all arguments broadcast against each other. Applies the same scalars,
+    caps and rejections as calculate_contracts (without logging) and
+    returns an int64 array of contract counts, 0 where a trade is rejected.
+    """
+    mlpc = np.asarray(max_loss_per_contract, dtype=float)
+    coll = np.asarray(collateral_per_contract, dtype=float)
+    capital = np.asarray(capital, dtype=float)
+    risk_fraction = np.asarray(risk_fraction, dtype=float)
+    open_risk = np.asarray(open_risk, dtype=float)
+    blended_score = np.asarray(blended_score, dtype=float)
+    confidence = np.asarray(confidence, dtype=float)
+
+    quality = 1.0 + blended_score / 100.0
+    model_quality_scalar = np.where(
+        blended_score >= 0, np.minimum(1.5, quality), np.maximum(0.8, quality)
+    )
+    contract_ceiling = np.where(
+        (confidence >= settings.high_confidence_threshold) & (blended_score >= 15),
+        settings.max_contracts_high_confidence,
+        settings.max_contracts_per_trade,
+    )
+    vix_scalar = np.clip(
+        1.25 / np.maximum(0.25, np.asarray(vix_daily_move_pct, dtype=float)), 0.5, 1.5
+    )
+
+    available_risk = (capital + open_risk) * settings.max_drawdown - open_risk
+    valid = (
+        (mlpc > 0) & (capital > 0) & (coll > 0)
+        & (coll <= capital) & (available_risk > 0)
+    )
+    # Rejected rows are zeroed below; keep their quotients finite meanwhile
+    safe_mlpc = np.where(valid, mlpc, 1.0)
+    safe_coll = np.where(valid, coll, 1.0)
+
+    risk_amount = capital * risk_fraction * model_quality_scalar * vix_scalar
+    contracts = np.minimum.reduce(np.broadcast_arrays(
+        np.trunc(risk_amount / safe_mlpc),
+        np.trunc(capital / safe_coll),
+        contract_ceiling,
+        np.trunc(available_risk / safe_mlpc),
+    ))
+    contracts = np.maximum(1, contracts).astype(np.int64)
+
+    valid &= coll * contracts <= capital
+    return np.where(valid, contracts, 0)
@@ -1,17 +1,49 @@
 """Paper trading engine - simulated order execution."""
 
 from __future__ import annotations
+from collections import defaultdict
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from typing import Optional
 import logging
 
+import numpy as np
+
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
 ET = ZoneInfo("America/New_York")
 
+# Decimal places applied when a trade dict leaves the engine (API/JSON).
+# Trade dicts keep full precision internally.
+_TRADE_ROUNDING = {
+    "pnl": 2, "pnl_pct": 2, "slippage": 4,
+    "mae": 2, "mfe": 2, "mae_pct": 2, "mfe_pct": 2,
+}
+
+# Bars per block when scanning for stop/target/trailing touches in replay_bars
+_REPLAY_BLOCK = 256
+
+
+def trade_to_json(trade: dict) -> dict:
+    """Copy of a PaperEngine trade dict rounded for display/serialization."""
+    out = dict(trade)
+    for key, ndigits in _TRADE_ROUNDING.items():
+        if key in out:
+            out[key] = round(out[key], ndigits)
+    return out
+
 
 class PaperPosition:
+    __slots__ = (
+        "symbol", "direction", "quantity", "original_quantity",
+        "entry_price", "entry_time", "stop_loss", "take_profit", "strategy",
+        "highest_since_entry", "lowest_since_entry", "scales_completed",
+        "effective_stop", "trailing_atr_mult", "mae", "mfe",
+        "entry_bar_count", "confidence", "slippage", "_is_long", "_dir_sign",
+    )
+
     def __init__(
         self,
         symbol: str,
@@ -40,22 +72,30 @@ class PaperPosition:
         self.mae: float = 0.0  # Max adverse excursion in $
         self.mfe: float = 0.0  # Max favorable excursion in $
         self.entry_bar_count: int = 0  # Set by trading engine
+        self.confidence: Optional[float] = None  # Set by open_position
+        self.slippage: float = 0.0  # Entry fill slippage in $
+        self._is_long = direction == "LONG"
+        self._dir_sign = 1.0 if self._is_long else -1.0
 
     def update_extremes(self, high: float, low: float):
-        self.highest_since_entry = max(self.highest_since_entry, high)
-        self.lowest_since_entry = min(self.lowest_since_entry, low)
-        # MAE/MFE tracking
-        if self.direction == "LONG":
-            self.mfe = max(self.mfe, (high - self.entry_price) * self.quantity)
-            self.mae = max(self.mae, (self.entry_price - low) * self.quantity)
+        if high > self.highest_since_entry:
+            self.highest_since_entry = high
+        if low < self.lowest_since_entry:
+            self.lowest_since_entry = low
+        # MAE/MFE tracking: favorable/adverse extreme depends on side
+        if self._is_long:
+            favorable = (high - self.entry_price) * self.quantity
+            adverse = (self.entry_price - low) * self.quantity
         else:
-            self.mfe = max(self.mfe, (self.entry_price - low) * self.quantity)
-            self.mae = max(self.mae, (high - self.entry_price) * self.quantity)
+            favorable = (self.entry_price - low) * self.quantity
+            adverse = (high - self.entry_price) * self.quantity
+        if favorable > self.mfe:
+            self.mfe = favorable
+        if adverse > self.mae:
+            self.mae = adverse
 
     def unrealized_pnl(self, current_price: float) -> float:
-        if self.direction == "LONG":
-            return (current_price - self.entry_price) * self.quantity
-        return (self.entry_price - current_price) * self.quantity
+        return (current_price - self.entry_price) * self.quantity * self._dir_sign
 
 
 class PaperEngine:
@@ -67,20 +107,40 @@ class PaperEngine:
         self.peak_capital = initial_capital
         self.position: Optional[PaperPosition] = None
         self.closed_trades: list[dict] = []
+        # Per-day [pnl, count] totals keyed by date ordinal, updated as trades close
+        self._daily_stats: defaultdict[int, list] = defaultdict(lambda: [0.0, 0])
+        # Columnar mirror of closed_trades for array analytics
+        self._trade_pnls: list[float] = []
+        self._trade_exit_days: list[int] = []  # date.toordinal() of exit
         self.slippage_bps: float = 1.0  # 0.01% slippage per side
+        self._base_slip_factor = 0.5 / 10000  # 0.5 bps base, as a price fraction
+
+    def _record_trade(self, trade: dict, exit_dt: datetime):
+        self.closed_trades.append(trade)
+        exit_day = exit_dt.toordinal()
+        self._trade_pnls.append(trade["pnl"])
+        self._trade_exit_days.append(exit_day)
+        stats = self._daily_stats[exit_day]
+        stats[0] += trade["pnl"]
+        stats[1] += 1
+
+        # Bound long-running sessions; per-day totals above are kept in full
+        cap = settings.max_closed_trades_in_memory
+        if cap > 0 and len(self.closed_trades) > cap:
+            del self.closed_trades[:-cap]
+            del self._trade_pnls[:-cap]
+            del self._trade_exit_days[:-cap]
 
     def _apply_slippage(self, price: float, is_buy: bool, quantity: int = 0, bar_volume: int = 0) -> float:
         """Volume-dependent slippage model.
         Base: 0.5 bps for SPY (very liquid)
         Impact: scales with order size relative to bar volume.
         """
-        base_bps = 0.5
-        impact_bps = 0.0
+        factor = self._base_slip_factor
         if bar_volume > 0 and quantity > 0:
-            participation_rate = quantity / bar_volume
-            impact_bps = participation_rate * 100  # 1% participation = 1bp extra
-        total_bps = base_bps + impact_bps
-        slip = price * (total_bps / 10000)
+            # 1% participation = 1bp extra, i.e. participation * 100 bps
+            factor += quantity / bar_volume * 0.01
+        slip = price * factor
         return price + slip if is_buy else price - slip
 
     def open_position(
@@ -94,6 +154,7 @@ class PaperEngine:
         strategy: str,
         bar_volume: int = 0,
         confidence: float = 0.5,
+        now: Optional[datetime] = None,
     ) -> Optional[PaperPosition]:
         if self.position is not None:
             logger.warning("Already have an open position")
@@ -107,7 +168,7 @@ class PaperEngine:
             direction=direction,
             quantity=quantity,
             entry_price=fill_price,
-            entry_time=datetime.now(ET),
+            entry_time=now or datetime.now(ET),
             stop_loss=stop_loss,
             take_profit=take_profit,
             strategy=strategy,
@@ -124,6 +185,7 @@ class PaperEngine:
     def close_position(
         self, price: float, reason: str = "manual",
         bar_volume: int = 0, current_bar_count: int = 0,
+        now: Optional[datetime] = None,
     ) -> Optional[dict]:
         if self.position is None:
             return None
@@ -133,8 +195,10 @@ class PaperEngine:
 
         pnl = self.position.unrealized_pnl(fill_price)
         self.capital += pnl
-        self.peak_capital = max(self.peak_capital, self.capital)
+        if self.capital > self.peak_capital:
+            self.peak_capital = self.capital
 
+        exit_dt = now or datetime.now(ET)
         trade = {
             "symbol": self.position.symbol,
             "direction": self.position.direction,
@@ -142,20 +206,20 @@ class PaperEngine:
             "entry_price": self.position.entry_price,
             "exit_price": fill_price,
             "entry_time": self.position.entry_time.isoformat(),
-            "exit_time": datetime.now(ET).isoformat(),
-            "pnl": round(pnl, 2),
-            "pnl_pct": round(pnl / (self.position.entry_price * self.position.quantity) * 100, 2),
+            "exit_time": exit_dt.isoformat(),
+            "pnl": pnl,
+            "pnl_pct": pnl / (self.position.entry_price * self.position.quantity) * 100,
             "exit_reason": reason,
             "strategy": self.position.strategy,
-            "confidence": getattr(self.position, 'confidence', None),
-            "slippage": round(getattr(self.position, 'slippage', 0) + abs(fill_price - price), 4),
-            "mae": round(self.position.mae, 2),
-            "mfe": round(self.position.mfe, 2),
-            "mae_pct": round(self.position.mae / (self.position.entry_price * self.position.original_quantity) * 100, 2) if self.position.original_quantity > 0 else 0.0,
-            "mfe_pct": round(self.position.mfe / (self.position.entry_price * self.position.original_quantity) * 100, 2) if self.position.original_quantity > 0 else 0.0,
+            "confidence": self.position.confidence,
+            "slippage": self.position.slippage + abs(fill_price - price),
+            "mae": self.position.mae,
+            "mfe": self.position.mfe,
+            "mae_pct": self.position.mae / (self.position.entry_price * self.position.original_quantity) * 100 if self.position.original_quantity > 0 else 0.0,
+            "mfe_pct": self.position.mfe / (self.position.entry_price * self.position.original_quantity) * 100 if self.position.original_quantity > 0 else 0.0,
             "bars_held": max(0, current_bar_count - self.position.entry_bar_count) if current_bar_count > 0 else None,
         }
-        self.closed_trades.append(trade)
+        self._record_trade(trade, exit_dt)
 
         logger.info(
             f"Paper CLOSE {self.position.direction} {self.position.quantity} "
@@ -168,6 +232,7 @@ class PaperEngine:
     def reduce_position(
         self, quantity: int, price: float, reason: str = "scale_out",
         bar_volume: int = 0, current_bar_count: int = 0,
+        now: Optional[datetime] = None,
     ) -> Optional[dict]:
         """Close a partial quantity of the current position."""
         if self.position is None:
@@ -179,14 +244,13 @@ class PaperEngine:
         fill_price = self._apply_slippage(price, not is_sell, self.position.quantity, bar_volume)
 
         # P&L for just the partial quantity
-        if self.position.direction == "LONG":
-            pnl = (fill_price - self.position.entry_price) * quantity
-        else:
-            pnl = (self.position.entry_price - fill_price) * quantity
+        pnl = (fill_price - self.position.entry_price) * quantity * self.position._dir_sign
 
         self.capital += pnl
-        self.peak_capital = max(self.peak_capital, self.capital)
+        if self.capital > self.peak_capital:
+            self.peak_capital = self.capital
 
+        exit_dt = now or datetime.now(ET)
         trade = {
             "symbol": self.position.symbol,
             "direction": self.position.direction,
@@ -194,21 +258,21 @@ class PaperEngine:
             "entry_price": self.position.entry_price,
             "exit_price": fill_price,
             "entry_time": self.position.entry_time.isoformat(),
-            "exit_time": datetime.now(ET).isoformat(),
-            "pnl": round(pnl, 2),
-            "pnl_pct": round(pnl / (self.position.entry_price * quantity) * 100, 2),
+            "exit_time": exit_dt.isoformat(),
+            "pnl": pnl,
+            "pnl_pct": pnl / (self.position.entry_price * quantity) * 100,
             "exit_reason": reason,
             "strategy": self.position.strategy,
             "is_partial": True,
-            "confidence": getattr(self.position, 'confidence', None),
-            "slippage": round(getattr(self.position, 'slippage', 0) + abs(fill_price - price), 4),
-            "mae": round(self.position.mae, 2),
-            "mfe": round(self.position.mfe, 2),
-            "mae_pct": round(self.position.mae / (self.position.entry_price * self.position.original_quantity) * 100, 2) if self.position.original_quantity > 0 else 0.0,
-            "mfe_pct": round(self.position.mfe / (self.position.entry_price * self.position.original_quantity) * 100, 2) if self.position.original_quantity > 0 else 0.0,
+            "confidence": self.position.confidence,
+            "slippage": self.position.slippage + abs(fill_price - price),
+            "mae": self.position.mae,
+            "mfe": self.position.mfe,
+            "mae_pct": self.position.mae / (self.position.entry_price * self.position.original_quantity) * 100 if self.position.original_quantity > 0 else 0.0,
+            "mfe_pct": self.position.mfe / (self.position.entry_price * self.position.original_quantity) * 100 if self.position.original_quantity > 0 else 0.0,
             "bars_held": max(0, current_bar_count - self.position.entry_bar_count) if current_bar_count > 0 else None,
         }
-        self.closed_trades.append(trade)
+        self._record_trade(trade, exit_dt)
 
         self.position.quantity -= quantity
         logger.info(
@@ -218,6 +282,99 @@ class PaperEngine:
         )
         return trade
 
+    @staticmethod
+    def _simulate_hold(
+        highs: np.ndarray, lows: np.ndarray, stop: float, tp: float, direction: int,
+        trail_dist: float = 0.0, extreme: float = 0.0,
+    ) -> tuple[int, float, Optional[str]]:
+        """Find the first bar that touches the stop, trailing stop or target.
+
+        direction is 1 for LONG, -1 for SHORT. With trail_dist > 0 each bar's
+        stop is tightened to trail_dist behind the best price before that
+        bar, starting from `extreme` (highest/lowest since entry); a bar's
+        own high/low only moves the trail from the next bar, since intrabar
+        order is unknown. Returns (bar index, exit price, reason) or
+        (-1, nan, None) if nothing is reached. When a stop and the target
+        are touched in the same bar the stop wins (conservative fill).
+        """
+        n = len(highs)
+        # Scan in fixed-size blocks so a hit near entry (the common case)
+        # stops early instead of building masks over the whole array.
+        for start in range(0, n, _REPLAY_BLOCK):
+            h = highs[start:start + _REPLAY_BLOCK]
+            lo = lows[start:start + _REPLAY_BLOCK]
+            level = stop
+            if trail_dist > 0:
+                # Best price before each bar, carried across blocks via extreme
+                prior = np.empty(len(h))
+                prior[0] = extreme
+                if direction > 0:
+                    prior[1:] = h[:-1]
+                    np.maximum.accumulate(prior, out=prior)
+                    level = np.maximum(prior - trail_dist, stop)
+                    extreme = max(prior[-1], h[-1])
+                else:
+                    prior[1:] = lo[:-1]
+                    np.minimum.accumulate(prior, out=prior)
+                    level = np.minimum(prior + trail_dist, stop)
+                    extreme = min(prior[-1], lo[-1])
+            if direction > 0:
+                stop_hit = lo <= level
+                tp_hit = h >= tp
+            else:
+                stop_hit = h >= level
+                tp_hit = lo <= tp
+            any_hit = stop_hit | tp_hit
+            if any_hit.any():
+                i = int(np.argmax(any_hit))
+                if not stop_hit[i]:
+                    return start + i, tp, "take_profit"
+                if trail_dist > 0 and level[i] != stop:
+                    return start + i, float(level[i]), "trailing_stop"
+                return start + i, stop, "stop_loss"
+        return -1, float("nan"), None
+
+    def replay_bars(
+        self, highs: np.ndarray, lows: np.ndarray,
+        atr: Optional[float] = None, trail_mult: Optional[float] = None,
+        bar_volume: int = 0, now: Optional[datetime] = None,
+    ) -> Optional[dict]:
+        """Replay the open position over historical bars in one pass.
+
+        Extremes/MAE/MFE are updated through the exit bar and the position is
+        closed at the first stop/target touch. Given an atr, the stop also
+        trails trail_mult * atr (default: the position's trailing_atr_mult)
+        behind the best price since entry. If nothing is touched the position
+        stays open, marked through the last bar, with effective_stop moved
+        up to the trail.
+        """
+        pos = self.position
+        if pos is None or len(highs) == 0:
+            return None
+        highs = np.asarray(highs, dtype=float)
+        lows = np.asarray(lows, dtype=float)
+        if trail_mult is None:
+            trail_mult = pos.trailing_atr_mult
+        trail_dist = trail_mult * atr if trail_mult and atr else 0.0
+        is_long = pos._is_long
+        idx, exit_price, reason = self._simulate_hold(
+            highs, lows, pos.effective_stop, pos.take_profit, 1 if is_long else -1,
+            trail_dist, pos.highest_since_entry if is_long else pos.lowest_since_entry,
+        )
+        end = idx + 1 if idx >= 0 else len(highs)
+        pos.update_extremes(float(highs[:end].max()), float(lows[:end].min()))
+        if idx < 0:
+            if trail_dist > 0:
+                if is_long:
+                    pos.effective_stop = max(pos.effective_stop, pos.highest_since_entry - trail_dist)
+                else:
+                    pos.effective_stop = min(pos.effective_stop, pos.lowest_since_entry + trail_dist)
+            return None
+        return self.close_position(
+            exit_price, reason=reason, bar_volume=bar_volume,
+            current_bar_count=pos.entry_bar_count + end, now=now,
+        )
+
     @property
     def equity(self) -> float:
         return self.capital
@@ -234,33 +391,22 @@ class PaperEngine:
             return 0.0
         return (self.peak_capital - self.capital) / self.peak_capital
 
+    def daily_stats(self, now: Optional[datetime] = None) -> tuple[float, int]:
+        """(P&L, trade count) for the ET day of `now` (default: wall clock)."""
+        stats = self._daily_stats.get((now or datetime.now(ET)).toordinal())
+        return (stats[0], stats[1]) if stats else (0.0, 0)
+
+    def trade_columns(self) -> tuple[np.ndarray, np.ndarray]:
+        """(exit day ordinals, P&Ls) of closed trades as arrays, in close order."""
+        return (
+            np.asarray(self._trade_exit_days, dtype=np.int64),
+            np.asarray(self._trade_pnls, dtype=float),
+        )
+
     @property
     def daily_pnl(self) -> float:
-        today = datetime.now(ET).date()
-        # Only scan recent trades (reverse iterate, stop at first different day)
-        total = 0.0
-        for t in reversed(self.closed_trades):
-            try:
-                trade_date = datetime.fromisoformat(t["exit_time"]).date()
-            except (ValueError, KeyError):
-                continue
-            if trade_date == today:
-                total += t["pnl"]
-            elif trade_date < today:
-                break
-        return total
+        return self.daily_stats()[0]
 
     @property
     def trades_today(self) -> int:
-        today = datetime.now(ET).date()
-        count = 0
-        for t in reversed(self.closed_trades):
-            try:
-                trade_date = datetime.fromisoformat(t["exit_time"]).date()
-            except (ValueError, KeyError):
-                continue
-            if trade_date == today:
-                count += 1
-            elif trade_date < today:
-                break
-        return count
+        return self.daily_stats()[1]
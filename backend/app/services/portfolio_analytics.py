@@ -13,19 +13,29 @@ Key metrics:
 """
 
 from __future__ import annotations
-import math
-import random
+import functools
 import logging
-from typing import Optional
+import math
+import time
+import zlib
+from datetime import datetime
+from zoneinfo import ZoneInfo
 
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+ET = ZoneInfo("America/New_York")
+
+# Shared generator for Monte Carlo resampling (seeded runs build their own)
+_MC_RNG = np.random.default_rng()
+# Max resample-matrix cells simulated at once (~8 MB of float64 per temporary)
+_MC_MAX_CELLS = 1_000_000
+
 
 # ── Metric computation ─────────────────────────────────────────────────────────
 
-def compute_cvar(returns: list[float], confidence: float = 0.95) -> float:
+def compute_cvar(returns: list[float] | np.ndarray, confidence: float = 0.95) -> float:
     """Conditional Value at Risk (Expected Shortfall) at the given confidence level.
 
     Returns the average loss in the worst (1-confidence) fraction of outcomes.
@@ -34,7 +44,7 @@ def compute_cvar(returns: list[float], confidence: float = 0.95) -> float:
     """
     if len(returns) < 5:
         return 0.0
-    arr = np.array(returns, dtype=float)
+    arr = np.asarray(returns, dtype=float)
     cutoff = np.percentile(arr, (1 - confidence) * 100)
     tail = arr[arr <= cutoff]
     if len(tail) == 0:
@@ -42,7 +52,7 @@ def compute_cvar(returns: list[float], confidence: float = 0.95) -> float:
     return float(-tail.mean())  # positive number representing expected tail loss
 
 
-def compute_omega_ratio(returns: list[float], threshold: float = 0.0) -> float:
+def compute_omega_ratio(returns: list[float] | np.ndarray, threshold: float = 0.0) -> float:
     """Omega ratio: probability-weighted gains above threshold / losses below threshold.
 
     Values > 1 indicate more probability mass above the threshold than below.
@@ -50,12 +60,12 @@ def compute_omega_ratio(returns: list[float], threshold: float = 0.0) -> float:
     """
     if len(returns) < 5:
         return 1.0
-    arr = np.array(returns, dtype=float)
+    arr = np.asarray(returns, dtype=float)
     gains = arr[arr > threshold] - threshold
     losses = threshold - arr[arr <= threshold]
     gain_sum = float(gains.sum()) if len(gains) > 0 else 0.0
     loss_sum = float(losses.sum()) if len(losses) > 0 else 1e-9
-    return round(gain_sum / loss_sum, 4)
+    return gain_sum / loss_sum
 
 
 def compute_ulcer_index(equity_curve: list[float]) -> float:
@@ -67,23 +77,113 @@ def compute_ulcer_index(equity_curve: list[float]) -> float:
         return 0.0
     arr = np.array(equity_curve, dtype=float)
     peak = np.maximum.accumulate(arr)
-    pct_dd = np.where(peak > 0, (arr - peak) / peak * 100, 0.0)
-    return float(np.sqrt(np.mean(pct_dd ** 2)))
+    if arr[0] > 0:
+        # Running peak never falls below arr[0], so every divisor is positive:
+        # build the drawdown series in place in a single buffer.
+        pct_dd = np.subtract(arr, peak)
+        np.divide(pct_dd, peak, out=pct_dd)
+        pct_dd *= 100.0
+    else:
+        pct_dd = np.where(peak > 0, (arr - peak) / peak * 100, 0.0)
+    return float(np.sqrt(np.dot(pct_dd, pct_dd) / len(pct_dd)))
+
+
+class RunningUlcer:
+    """Streaming Ulcer Index over the equity curve `base + cumsum(pnls)`.
+
+    Matches compute_ulcer_index on that curve without keeping it: each added
+    P&L updates the running equity, peak and sum of squared % drawdowns.
+    """
+
+    __slots__ = ("base", "equity", "peak", "sq_sum", "n")
+
+    def __init__(self, base: float):
+        self.base = base
+        self.equity = base
+        self.peak = base
+        self.sq_sum = 0.0
+        self.n = 0
+
+    def add(self, pnl: float) -> None:
+        self.equity += pnl
+        # The curve's running peak starts at its first point, not at base
+        if self.n == 0 or self.equity > self.peak:
+            self.peak = self.equity
+        if self.peak > 0:
+            dd = (self.equity - self.peak) / self.peak * 100
+            self.sq_sum += dd * dd
+        self.n += 1
+
+    @property
+    def value(self) -> float:
+        return math.sqrt(self.sq_sum / self.n) if self.n >= 2 else 0.0
 
 
 def compute_sortino(returns: list[float], risk_free: float = 0.0) -> float:
     """Sortino ratio: mean excess return / downside deviation."""
     if len(returns) < 5:
         return 0.0
-    arr = np.array(returns, dtype=float)
-    excess = arr - risk_free
+    arr = np.asarray(returns, dtype=float)
     downside = arr[arr < risk_free]
-    if len(downside) == 0:
+    n_down = len(downside)
+    if n_down == 0:
         return float("inf")
-    downside_std = float(np.std(downside))
+    # Population std of the downside returns, reusing one centred buffer
+    dev = downside - downside.mean()
+    downside_std = math.sqrt(float(np.dot(dev, dev)) / n_down)
     if downside_std == 0:
         return 0.0
-    return round(float(np.mean(excess)) / downside_std, 4)
+    # mean(arr - rf) == mean(arr) - rf; no excess-return array needed
+    return (float(arr.mean()) - risk_free) / downside_std
+
+
+def _bootstrap_weights(n: int, n_boot: int, rng: np.random.Generator) -> np.ndarray:
+    """(n_boot, n) multinomial resample counts; each row sums to n.
+
+    Row b says how many times each observation appears in resample b, so
+    statistics over all resamples become matrix-vector products instead of
+    an index-resampling loop.
+    """
+    return rng.multinomial(n, np.full(n, 1.0 / n), size=n_boot)
+
+
+def _bootstrap_means(x: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Mean of every resample."""
+    return weights @ x / len(x)
+
+
+def _bootstrap_cvar(
+    x_sorted: np.ndarray, weights: np.ndarray, confidence: float = 0.95,
+) -> np.ndarray:
+    """compute_cvar of every resample, from ascending x and its counts.
+
+    The cutoff is np.percentile's linear interpolation between two order
+    statistics of the resample, located through the cumulative counts; the
+    tail loss is then a masked weighted mean.
+    """
+    n = len(x_sorted)
+    h = (1 - confidence) * (n - 1)
+    j = int(h)
+    frac = h - j
+    cum = np.cumsum(weights, axis=1)
+    # The j-th order statistic is the first x whose cumulative count exceeds j
+    v_lo = x_sorted[(cum <= j).sum(axis=1)]
+    v_hi = x_sorted[(cum <= min(j + 1, n - 1)).sum(axis=1)]
+    diff = v_hi - v_lo
+    # Same two-sided lerp as np.percentile, so ties resolve identically
+    cutoff = v_hi - diff * (1 - frac) if frac >= 0.5 else v_lo + diff * frac
+    tail = np.where(x_sorted <= cutoff[:, None], weights, 0)
+    return -(tail @ x_sorted) / tail.sum(axis=1)
+
+
+def _bootstrap_omega(x: np.ndarray, weights: np.ndarray, threshold: float = 0.0) -> np.ndarray:
+    """compute_omega_ratio of every resample: a ratio of two weighted sums.
+
+    As in compute_omega_ratio, a resample without losses divides by 1e-9.
+    """
+    gain_sum = weights @ np.maximum(x - threshold, 0.0)
+    loss_sum = weights @ np.maximum(threshold - x, 0.0)
+    return gain_sum / np.where(loss_sum > 0, loss_sum, 1e-9)
 
 
 def run_monte_carlo(
@@ -91,11 +191,13 @@ def run_monte_carlo(
     initial_capital: float,
     n_simulations: int = 2000,
     n_days: int = 21,   # ~1 trading month
+    seed: int | None = None,
 ) -> dict:
     """Bootstrap Monte Carlo simulation of N-day forward P&L.
 
     Resamples from the empirical return distribution (with replacement).
-    Returns the simulated equity percentile bands.
+    Returns the simulated equity percentile bands. Pass `seed` for a
+    reproducible run; otherwise the module-level generator is used.
 
     Returns:
         {
@@ -119,38 +221,38 @@ def run_monte_carlo(
         }
 
     arr = np.array(returns, dtype=float)
-    rng = np.random.default_rng(seed=42)
-
-    ending_equities: list[float] = []
-    max_drawdowns: list[float] = []
-
-    for _ in range(n_simulations):
-        # Sample n_days returns with replacement
-        sampled = rng.choice(arr, size=n_days, replace=True)
-        # Simulate equity curve (each return is a P&L dollar amount)
-        equity = initial_capital
-        peak = initial_capital
-        max_dd = 0.0
-        for r in sampled:
-            equity += r
-            if equity > peak:
-                peak = equity
-            dd = (peak - equity) / peak if peak > 0 else 0.0
-            max_dd = max(max_dd, dd)
-        ending_equities.append(equity)
-        max_drawdowns.append(max_dd)
-
-    eq_arr = np.array(ending_equities)
-    dd_arr = np.array(max_drawdowns)
+    rng = _MC_RNG if seed is None else np.random.default_rng(seed)
+
+    eq_arr = np.empty(n_simulations)
+    dd_arr = np.empty(n_simulations)
+    # Simulate in row blocks so the resample matrix stays bounded for large
+    # n_simulations × n_days; block draws consume the same random stream as
+    # one full-size draw, so results don't depend on the block size.
+    block = max(1, _MC_MAX_CELLS // n_days)
+    for start in range(0, n_simulations, block):
+        stop = min(start + block, n_simulations)
+        # Each row is a simulated path of P&L dollar amounts
+        sampled = rng.choice(arr, size=(stop - start, n_days), replace=True)
+        equity = np.cumsum(sampled, axis=1)
+        equity += initial_capital
+        # Running peak starts at the initial capital, not the first simulated day
+        peak = np.maximum.accumulate(equity, axis=1)
+        np.maximum(peak, initial_capital, out=peak)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dd = np.where(peak > 0, (peak - equity) / peak, 0.0)
+        eq_arr[start:stop] = equity[:, -1]
+        dd_arr[start:stop] = np.maximum(dd.max(axis=1), 0.0)
+
+    p5, p25, p50, p75, p95 = np.percentile(eq_arr, [5, 25, 50, 75, 95])
 
     return {
         "n_simulations": n_simulations,
         "n_days": n_days,
-        "p5":  round(float(np.percentile(eq_arr, 5)), 2),
-        "p25": round(float(np.percentile(eq_arr, 25)), 2),
-        "p50": round(float(np.percentile(eq_arr, 50)), 2),
-        "p75": round(float(np.percentile(eq_arr, 75)), 2),
-        "p95": round(float(np.percentile(eq_arr, 95)), 2),
+        "p5":  round(float(p5), 2),
+        "p25": round(float(p25), 2),
+        "p50": round(float(p50), 2),
+        "p75": round(float(p75), 2),
+        "p95": round(float(p95), 2),
         "prob_loss": round(float((eq_arr < initial_capital).mean()), 4),
         "prob_dd_5pct": round(float((dd_arr > 0.05).mean()), 4),
     }
@@ -164,17 +266,11 @@ def compute_greeks_exposure(position) -> dict:
     if position is None:
         return {"delta": 0.0, "gamma": 0.0, "theta": 0.0, "vega": 0.0, "net_delta_notional": 0.0}
 
-    total_delta = 0.0
-    total_gamma = 0.0
-    total_theta = 0.0
-    total_vega = 0.0
-
-    for leg in position.order.legs:
-        sign = -1.0 if "SELL" in leg.action.value else 1.0
-        total_delta += sign * leg.delta * leg.quantity
-        total_gamma += sign * leg.gamma * leg.quantity
-        total_theta += sign * leg.theta * leg.quantity
-        total_vega  += sign * leg.vega  * leg.quantity
+    # Net Greeks are aggregated once from the legs when the position opens
+    total_delta = position.net_delta
+    total_gamma = position.net_gamma
+    total_theta = position.net_theta
+    total_vega = position.net_vega
 
     underlying = position.entry_underlying
     net_delta_notional = total_delta * underlying * 100  # dollar delta exposure
@@ -188,59 +284,97 @@ def compute_greeks_exposure(position) -> dict:
     }
 
 
+@functools.lru_cache(maxsize=16384)
+def _exit_epoch(exit_time: str) -> float:
+    """Epoch of an ISO exit_time; NaN if unparseable.
+
+    Naive values (as restored from SQLite) are ET. Trade exit times never
+    change, so repeat snapshots and trade restores hit the cache.
+    """
+    try:
+        dt = datetime.fromisoformat(exit_time)
+    except ValueError:
+        return float("nan")
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=ET)
+    return dt.timestamp()
+
+
 def compute_rolling_performance(
     closed_trades: list[dict],
     lookback_days: int = 90,
 ) -> dict[str, dict]:
     """Compute per-strategy rolling performance over the last `lookback_days` trading days.
 
-    Returns a mapping of strategy_name -> {win_rate, profit_factor, total_pnl, trades}.
+    Returns a mapping of strategy_name -> {win_rate, profit_factor, total_pnl, trades,
+    avg_pnl_ci95, cvar_95, cvar_95_ci95, omega, omega_ci95, ...}.
     Strategies with < 5 trades in the window are flagged as `insufficient_data`.
     """
-    from datetime import datetime, timedelta, timezone
-    cutoff = datetime.now(timezone.utc) - timedelta(days=lookback_days)
-
+    cutoff = time.time() - lookback_days * 86400
+
+    # Exit epochs for the whole history in one array; unparseable or
+    # missing exit times come back NaN and drop out of the mask.
+    epochs = np.fromiter(
+        (_exit_epoch(t.get("exit_time") or "") for t in closed_trades),
+        dtype=float, count=len(closed_trades),
+    )
     strategy_trades: dict[str, list[float]] = {}
-    for trade in closed_trades:
-        try:
-            exit_time_str = trade.get("exit_time", "")
-            if not exit_time_str:
-                continue
-            exit_dt = datetime.fromisoformat(exit_time_str)
-            # Make timezone-aware if needed
-            if exit_dt.tzinfo is None:
-                from zoneinfo import ZoneInfo
-                exit_dt = exit_dt.replace(tzinfo=ZoneInfo("America/New_York"))
-            if exit_dt < cutoff:
-                continue
-            strat = trade.get("strategy", "unknown")
-            pnl = trade.get("pnl", 0.0)
-            strategy_trades.setdefault(strat, []).append(float(pnl))
-        except Exception:
+    for i in np.flatnonzero(epochs >= cutoff):
+        trade = closed_trades[i]
+        pnl = trade.get("pnl", 0.0)
+        if pnl is None:
             continue
+        strategy_trades.setdefault(trade.get("strategy", "unknown"), []).append(float(pnl))
 
     result = {}
     for strat, pnls in strategy_trades.items():
-        wins = [p for p in pnls if p > 0]
-        losses = [p for p in pnls if p <= 0]
-        avg_win = float(np.mean(wins)) if wins else 0.0
-        avg_loss = abs(float(np.mean(losses))) if losses else 0.0
-        pf = (sum(wins) / abs(sum(losses))) if losses else (sum(wins) if wins else 0.0)
+        # One array per strategy, shared by every metric below
+        arr = np.asarray(pnls, dtype=float)
+        n = len(arr)
+        win_mask = arr > 0
+        wins = arr[win_mask]
+        losses = arr[~win_mask]
+        n_wins = len(wins)
+        win_sum = float(wins.sum())
+        loss_sum = float(losses.sum())
+        total = float(arr.sum())
+        avg_win = win_sum / n_wins if n_wins else 0.0
+        avg_loss = abs(loss_sum / len(losses)) if len(losses) else 0.0
+        pf = (win_sum / abs(loss_sum)) if len(losses) else win_sum
+        cvar = compute_cvar(arr)
+        omega = compute_omega_ratio(arr)
+        # 95% bootstrap intervals from one shared resample-count matrix (0
+        # width below 5 trades). Seeded from the P&L values so repeated polls
+        # over the same history return the same interval.
+        if n >= 5:
+            x = np.sort(arr)
+            rng = np.random.default_rng(zlib.crc32(x.tobytes()))
+            weights = _bootstrap_weights(n, 1000, rng)
+            avg_lo, avg_hi = np.percentile(_bootstrap_means(x, weights), [2.5, 97.5])
+            cvar_lo, cvar_hi = np.percentile(_bootstrap_cvar(x, weights), [2.5, 97.5])
+            omega_lo, omega_hi = np.percentile(_bootstrap_omega(x, weights), [2.5, 97.5])
+        else:
+            avg_lo = avg_hi = total / n
+            cvar_lo = cvar_hi = cvar
+            omega_lo = omega_hi = omega
         result[strat] = {
-            "trades": len(pnls),
-            "win_rate": round(len(wins) / len(pnls), 4) if pnls else 0.0,
+            "trades": n,
+            "win_rate": round(n_wins / n, 4),
             "profit_factor": round(pf, 4),
-            "total_pnl": round(sum(pnls), 2),
+            "total_pnl": round(total, 2),
             "avg_win": round(avg_win, 2),
             "avg_loss": round(avg_loss, 2),
-            "cvar_95": round(compute_cvar(pnls), 2),
-            "omega": round(compute_omega_ratio(pnls), 4),
-            "insufficient_data": len(pnls) < 5,
+            "avg_pnl_ci95": [round(float(avg_lo), 2), round(float(avg_hi), 2)],
+            "cvar_95": round(cvar, 2),
+            "cvar_95_ci95": [round(float(cvar_lo), 2), round(float(cvar_hi), 2)],
+            "omega": round(omega, 4),
+            "omega_ci95": [round(float(omega_lo), 4), round(float(omega_hi), 4)],
+            "insufficient_data": n < 5,
             "retire_recommended": (
-                len(pnls) >= 10 and (
-                    (len(wins) / len(pnls)) < 0.50      # WR < 50%
-                    or sum(pnls) < 0                     # negative total P&L
-                    or pf < 1.0                          # losing profit factor
+                n >= 10 and (
+                    (n_wins / n) < 0.50      # WR < 50%
+                    or total < 0             # negative total P&L
+                    or pf < 1.0              # losing profit factor
                 )
             ),
         }
@@ -262,14 +396,6 @@ def get_portfolio_snapshot(
     closed_trades = paper_engine.closed_trades
     returns = [t.get("pnl", 0.0) for t in closed_trades if t.get("pnl") is not None]
 
-    # Build equity curve from cumulative P&L
-    equity_curve = []
-    running_equity = initial_capital
-    for t in closed_trades:
-        pnl = t.get("pnl", 0.0) or 0.0
-        running_equity += float(pnl)
-        equity_curve.append(running_equity)
-
     # Current open position equity
     current_equity = paper_engine.total_equity(current_spy_price)
 
@@ -287,7 +413,8 @@ def get_portfolio_snapshot(
         "total_trades": len(returns),
         "cvar_95": round(compute_cvar(returns), 2),
         "omega_ratio": round(compute_omega_ratio(returns), 4),
-        "ulcer_index": round(compute_ulcer_index(equity_curve if equity_curve else [initial_capital]), 4),
+        # Maintained incrementally by the engine as trades close
+        "ulcer_index": round(paper_engine.ulcer_index(initial_capital), 4),
         "sortino_ratio": round(compute_sortino(returns), 4),
         "greeks": greeks,
         "delta_adjusted_exposure_pct": round(
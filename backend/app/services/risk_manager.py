@@ -1,6 +1,7 @@
 """Risk management: position sizing, daily limits, circuit breakers, adaptive Kelly."""
 
 from __future__ import annotations
+from collections import deque
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from typing import Optional
@@ -32,14 +33,20 @@ class RiskManager:
         self.circuit_breaker_active = False
 
         # Adaptive Kelly tracking (rolling window of last 50 trades)
-        self._trade_results: list[float] = []
         self._kelly_window = 50
+        self._trade_results: deque[float] = deque(maxlen=self._kelly_window)
         self._kelly_fraction = 0.25  # Use quarter-Kelly for safety
+        # ((max_risk_per_trade, vix), risk fraction) from the last computation;
+        # cleared whenever a trade result is recorded
+        self._kelly_cache: Optional[tuple[tuple[float, float], float]] = None
 
         # VIX-adjusted sizing (updated from trading engine on each data fetch)
         self._current_vix: float = 20.0
         self._vix_term_ratio: float = 0.90   # VIX / VIX3M; < 1.0 = contango (normal)
 
+        # Last ((hour, minute), scalar) from _time_of_day_scalar
+        self._tod_cache: tuple[Optional[tuple[int, int]], float] = (None, 1.0)
+
     def set_vix(self, vix: float, vix3m: float = 0.0):
         """Update VIX level and term structure ratio for dynamic Kelly sizing."""
         self._current_vix = max(5.0, vix)
@@ -62,19 +69,33 @@ class RiskManager:
         Full Kelly = W - (1-W)/R where W=win_rate, R=avg_win/avg_loss.
         We use fractional Kelly (quarter-Kelly) further scaled by VIX level.
         Falls back to the configured max_risk_per_trade when insufficient data.
+        Memoized until the next recorded trade or a change in VIX / max risk.
         """
+        key = (self.max_risk_per_trade, self._current_vix)
+        if self._kelly_cache is not None and self._kelly_cache[0] == key:
+            return self._kelly_cache[1]
+
         if len(self._trade_results) < 10:
             base = self.max_risk_per_trade
         else:
-            wins = [r for r in self._trade_results if r > 0]
-            losses = [r for r in self._trade_results if r <= 0]
+            # One pass over the window for win count and win/loss sums
+            n_wins = 0
+            win_sum = 0.0
+            loss_sum = 0.0
+            for r in self._trade_results:
+                if r > 0:
+                    n_wins += 1
+                    win_sum += r
+                else:
+                    loss_sum += r
+            n_losses = len(self._trade_results) - n_wins
 
-            if not wins or not losses:
+            if not n_wins or not n_losses:
                 base = self.max_risk_per_trade
             else:
-                win_rate = len(wins) / len(self._trade_results)
-                avg_win = sum(wins) / len(wins)
-                avg_loss = abs(sum(losses) / len(losses))
+                win_rate = n_wins / len(self._trade_results)
+                avg_win = win_sum / n_wins
+                avg_loss = abs(loss_sum / n_losses)
 
                 if avg_loss == 0:
                     base = self.max_risk_per_trade
@@ -85,22 +106,30 @@ class RiskManager:
 
         # Dynamic VIX adjustment: scale down in high-vol environments
         kelly_adjusted = base * self._vix_size_scalar()
-        return max(0.002, min(kelly_adjusted, self.max_risk_per_trade))
+        fraction = max(0.002, min(kelly_adjusted, self.max_risk_per_trade))
+        self._kelly_cache = (key, fraction)
+        return fraction
 
     def _time_of_day_scalar(self) -> float:
         """Scale position size based on time of day."""
-        from datetime import time as dt_time
-        now = datetime.now(ET).time()
-        if now < dt_time(9, 45):
-            return 0.5  # Opening volatility
-        elif now < dt_time(11, 30):
-            return 1.0  # Best setups
-        elif now < dt_time(13, 30):
-            return 0.6  # Lunch chop
-        elif now < dt_time(15, 30):
-            return 0.8  # Afternoon
+        now = datetime.now(ET)
+        key = (now.hour, now.minute)
+        if key == self._tod_cache[0]:
+            return self._tod_cache[1]
+        # Step function over minute-of-day, so one evaluation per minute
+        minute = now.hour * 60 + now.minute
+        if minute < 9 * 60 + 45:
+            scalar = 0.5  # Opening volatility
+        elif minute < 11 * 60 + 30:
+            scalar = 1.0  # Best setups
+        elif minute < 13 * 60 + 30:
+            scalar = 0.6  # Lunch chop
+        elif minute < 15 * 60 + 30:
+            scalar = 0.8  # Afternoon
         else:
-            return 0.5  # EOD volatility
+            scalar = 0.5  # EOD volatility
+        self._tod_cache = (key, scalar)
+        return scalar
 
     def calculate_position_size(
         self, signal: TradeSignal, capital: float
@@ -193,18 +222,19 @@ class RiskManager:
             return False, f"Max trades per day reached: {trades_today}/{self.max_trades_per_day}"
 
         # Cooldown after consecutive losses
-        if self.cooldown_until and datetime.now(ET) < self.cooldown_until:
-            remaining = (self.cooldown_until - datetime.now(ET)).seconds // 60
-            return False, f"Cooling off: {remaining} min remaining after {self.cooldown_after_losses} consecutive losses"
+        if self.cooldown_until:
+            now = datetime.now(ET)
+            if now < self.cooldown_until:
+                remaining = (self.cooldown_until - now).seconds // 60
+                return False, f"Cooling off: {remaining} min remaining after {self.cooldown_after_losses} consecutive losses"
 
         return True, "OK"
 
     def record_trade_result(self, pnl: float):
         """Update consecutive loss counter, trigger cooldown, and track for Kelly sizing."""
         # Track for adaptive Kelly
-        self._trade_results.append(pnl)
-        if len(self._trade_results) > self._kelly_window:
-            self._trade_results = self._trade_results[-self._kelly_window:]
+        self._kelly_cache = None
+        self._trade_results.append(pnl)  # deque evicts beyond the window
 
         if pnl <= 0:
             self.consecutive_losses += 1
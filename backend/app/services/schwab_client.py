@@ -1,16 +1,239 @@
 """Charles Schwab API client wrapper using schwab-py."""
 
 from __future__ import annotations
+import asyncio
 import json
 import logging
+import math
+import os
+import random
+import tempfile
+import time
+import uuid
+from collections.abc import Sequence
 from typing import Optional
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from types import MappingProxyType
+
+import httpx
 
 from app.config import settings
+from app.services.options.models import OptionAction
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # optional speedup for large chain/history payloads
+    _json_loads = json.loads
+
+try:
+    import schwab
+    import schwab.streaming
+    from schwab.orders.equities import equity_buy_market, equity_sell_market
+except ImportError:  # optional: without schwab-py the app runs paper-only
+    schwab = None
 
 logger = logging.getLogger(__name__)
 
+# get_quote calls arriving within this window share one multi-symbol request
+QUOTE_BATCH_WINDOW_SEC = 0.02
+QUOTE_BATCH_MAX = 50
+
+# Wait before re-opening the quote stream after it drops
+STREAM_RECONNECT_SEC = 5.0
+
+# Accepted orders are kept this long per client_order_id so a repeated
+# submission returns the original result instead of placing a second order
+ORDER_DEDUPE_TTL_SEC = 300.0
+
+# Background token refresh lead. Earlier than authlib's 300s refresh leeway,
+# so requests never find the token inside the window and refresh inline.
+TOKEN_REFRESH_LEAD_SEC = 360
+
+# Retry policy for transient Schwab failures
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+RETRY_MAX_ATTEMPTS = 5
+RETRY_BASE_SEC = 0.5
+RETRY_CAP_SEC = 8.0
+RETRY_JITTER_SEC = 0.25
+# Transport errors raised before the request reached the server
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Capped exponential backoff plus jitter; never shorter than Retry-After."""
+    delay = min(RETRY_CAP_SEC, RETRY_BASE_SEC * 2 ** attempt) + random.uniform(0, RETRY_JITTER_SEC)
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass  # HTTP-date form; fall back to our own backoff
+    return delay
+
+# Frozen order-spec prototypes; per-order fields are merged in with {**proto, ...}
+_DAY_SESSION = MappingProxyType({"session": "NORMAL", "duration": "DAY"})
+_MARKET_PROTO = MappingProxyType({"orderType": "MARKET", **_DAY_SESSION})
+_STOP_PROTO = MappingProxyType({"orderType": "STOP", **_DAY_SESSION})
+_LIMIT_PROTO = MappingProxyType({"orderType": "LIMIT", **_DAY_SESSION})
+_TRAILING_STOP_PROTO = MappingProxyType({
+    "orderType": "TRAILING_STOP",
+    **_DAY_SESSION,
+    "stopPriceLinkBasis": "LAST",
+    "stopPriceLinkType": "PERCENT",
+})
+_COMPLEX_STRATEGY_BY_LEGS = MappingProxyType({2: "VERTICAL", 4: "IRON_CONDOR"})
+
+
+def _equity_legs(instruction: str, quantity: int, symbol: str) -> list[dict]:
+    return [{
+        "instruction": instruction,
+        "quantity": quantity,
+        "instrument": {"symbol": symbol, "assetType": "EQUITY"},
+    }]
+
+
+def _option_legs(legs, closing: bool = False) -> list[dict]:
+    """orderLegCollection for option legs; closing reverses each leg's action."""
+    if closing:
+        short_instr, long_instr = "BUY_TO_CLOSE", "SELL_TO_CLOSE"
+    else:
+        short_instr, long_instr = "SELL_TO_OPEN", "BUY_TO_OPEN"
+    return [
+        {
+            "instruction": short_instr if leg.action == OptionAction.SELL_TO_OPEN else long_instr,
+            "quantity": leg.quantity,
+            "instrument": {"symbol": leg.contract_symbol, "assetType": "OPTION"},
+        }
+        for leg in legs
+    ]
+
+# Quote timestamps are second-resolution; reuse the formatted string within a second
+_iso_sec = 0
+_iso_str = ""
+
+
+def _utc_iso_now() -> str:
+    global _iso_sec, _iso_str
+    sec = int(time.time())
+    if sec != _iso_sec:
+        _iso_str = datetime.fromtimestamp(sec, timezone.utc).isoformat()
+        _iso_sec = sec
+    return _iso_str
+
+
+def _atomic_token_writer(path: Path):
+    """schwab-py token write func: temp file + os.replace, never a torn file.
+
+    mkstemp gives each writer its own 0600 temp file in the token's
+    directory, so concurrent refreshes don't collide and the replaced token
+    file never ends up more permissive than owner-only.
+    """
+    def write_token(token, *args, **kwargs):
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(token).encode())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+    return write_token
+
+
+def response_json(resp):
+    """Decode a Schwab response body, with orjson when it is installed."""
+    return _json_loads(resp.content)
+
+
+class _TTLCache:
+    """key -> (expires_at, value) on the monotonic clock."""
+
+    def __init__(self):
+        self._data: dict = {}
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry[1]
+
+    def set(self, key, value, ttl: float):
+        if ttl > 0:
+            now = time.monotonic()
+            # Drop expired entries too: keys that are never read again (e.g.
+            # one-off order ids) would otherwise stay in _data forever
+            expired = [k for k, (expires_at, _) in self._data.items() if expires_at <= now]
+            for k in expired:
+                del self._data[k]
+            self._data[key] = (now + ttl, value)
+
+    def discard(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+
+class AdaptiveTokenBucket:
+    """Token bucket in front of the Schwab API with AIMD rate control.
+
+    Refills at ``rate`` tokens/sec up to ``capacity``. A 429 halves the
+    rate (floored at ``min_rate``); each success adds ``increase`` back,
+    never above ``max_rate``.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        min_rate: float,
+        increase: float,
+    ):
+        self.rate = rate
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        # Lock so waiters are served in arrival order
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def decrease_rate(self):
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def increase_rate(self):
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
 
 class SchwabClient:
     """Wrapper around schwab-py for OAuth2, quotes, orders, and streaming."""
@@ -19,6 +242,22 @@ class SchwabClient:
         self._client = None
         self._stream_client = None
         self._account_hash = settings.schwab_account_hash
+        # Memoized responses; TTLs come from settings.schwab_*_ttl_sec
+        self._cache = _TTLCache()
+        # client_order_id -> in-flight future or order result; not cleared by invalidate()
+        self._order_dedupe = _TTLCache()
+        # (symbol, future) requests coalesced by _quote_batcher
+        self._quote_queue: Optional[asyncio.Queue] = None
+        self._batcher_task: Optional[asyncio.Task] = None
+        # Streamed LEVELONE_EQUITIES state: raw merged fields and parsed quotes
+        self._stream_task: Optional[asyncio.Task] = None
+        self._token_task: Optional[asyncio.Task] = None
+        self._stream_fields: dict[str, dict] = {}
+        self._stream_quotes: dict[str, dict] = {}
+        rate = settings.schwab_requests_per_minute / 60.0
+        self._limiter = AdaptiveTokenBucket(
+            rate=rate, capacity=max(1.0, rate * 5), min_rate=rate / 8, increase=rate / 20,
+        )
 
     @property
     def is_configured(self) -> bool:
@@ -30,20 +269,33 @@ class SchwabClient:
             logger.warning("Schwab API not configured - running in paper-only mode")
             return
 
-        try:
-            import schwab
-        except ImportError:
+        if schwab is None:
             logger.warning("schwab-py not installed - running in paper-only mode")
             return
 
         try:
             token_path = Path(settings.schwab_token_path)
             if token_path.exists():
-                self._client = schwab.auth.client_from_token_file(
-                    token_path=str(token_path),
-                    api_key=settings.schwab_app_key,
-                    app_secret=settings.schwab_app_secret,
+                # Async client: every call shares one pooled httpx.AsyncClient
+                # session (keep-alive, single TLS handshake) and awaits instead
+                # of blocking the event loop. Token refresh is single-flight:
+                # authlib's AsyncOAuth2Client.ensure_active_token re-checks
+                # expiry under its own asyncio.Lock, so a gather() fan-out
+                # near expiry issues one refresh POST and the rest reuse it
+                self._client = schwab.auth.client_from_access_functions(
+                    settings.schwab_app_key,
+                    settings.schwab_app_secret,
+                    token_read_func=lambda: json.loads(token_path.read_bytes()),
+                    token_write_func=_atomic_token_writer(token_path),
+                    asyncio=True,
                 )
+                self._client.set_timeout(10)
+                self._token_task = asyncio.create_task(self._token_refresher())
+                self._quote_queue = asyncio.Queue()
+                self._batcher_task = asyncio.create_task(self._quote_batcher())
+                symbols = [x.strip() for x in settings.schwab_stream_symbols.split(",") if x.strip()]
+                if symbols:
+                    self._stream_task = asyncio.create_task(self._run_quote_stream(symbols))
                 logger.info("Schwab client initialized from token file")
             else:
                 logger.warning(
@@ -53,48 +305,380 @@ class SchwabClient:
         except Exception as e:
             logger.error(f"Failed to initialize Schwab client: {e}")
 
-    async def get_quote(self, symbol: str = "SPY") -> Optional[dict]:
+    async def aclose(self):
+        """Close the pooled HTTP session. Called on app shutdown."""
+        if self._token_task is not None:
+            self._token_task.cancel()
+            self._token_task = None
+        if self._stream_task is not None:
+            self._stream_task.cancel()
+            self._stream_task = None
+        if self._stream_client is not None:
+            try:
+                await self._stream_client.logout()
+            except Exception as e:
+                logger.debug(f"Quote stream logout failed: {e}")
+            self._stream_client = None
+        self._stream_quotes.clear()
+        if self._batcher_task is not None:
+            self._batcher_task.cancel()
+            self._batcher_task = None
+        if self._quote_queue is not None:
+            while not self._quote_queue.empty():
+                _, fut = self._quote_queue.get_nowait()
+                if not fut.done():
+                    fut.set_result(None)
+            self._quote_queue = None
+        if self._client is None:
+            return
+        try:
+            await self._client.close_async_session()
+        except Exception as e:
+            logger.error(f"Error closing Schwab session: {e}")
+        self._client = None
+
+    async def _call(self, method, *args, idempotent: bool = True, **kwargs):
+        """Issue one schwab-py request through the rate limiter.
+
+        Retries 429/5xx responses and transport errors with exponential
+        backoff. Non-idempotent calls (order placement and replacement) are
+        only retried on 429 or when the request never left the client: after
+        a 5xx or a read timeout the order may already be working.
+        """
+        for attempt in range(RETRY_MAX_ATTEMPTS):
+            last = attempt == RETRY_MAX_ATTEMPTS - 1
+            try:
+                async with self._limiter:
+                    resp = await method(*args, **kwargs)
+            except httpx.TransportError as e:
+                if last or not (idempotent or isinstance(e, _UNSENT_ERRORS)):
+                    raise
+                delay = _backoff_delay(attempt)
+                logger.warning(f"Schwab request error ({e!r}); retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            status = resp.status_code
+            if status < 300:
+                self._limiter.increase_rate()
+                return resp
+            if status == 429:
+                self._limiter.decrease_rate()
+                logger.warning(f"Schwab rate limited; backing off to {self._limiter.rate * 60:.0f} req/min")
+            if last or status not in RETRY_STATUS or (status != 429 and not idempotent):
+                return resp
+            delay = _backoff_delay(attempt, resp.headers.get("Retry-After"))
+            logger.warning(f"Schwab HTTP {status}; retry {attempt + 1} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def _token_refresher(self):
+        """Refresh the access token TOKEN_REFRESH_LEAD_SEC before it expires.
+
+        Keeps the OAuth round trip off order placement and quote calls. If a
+        refresh fails, authlib still refreshes inline once inside its leeway.
+        """
+        session = self._client.session
+        while True:
+            expires_at = (session.token or {}).get("expires_at")
+            if not expires_at:
+                logger.warning("Schwab token has no expires_at; background refresh disabled")
+                return
+            await asyncio.sleep(max(0.0, expires_at - TOKEN_REFRESH_LEAD_SEC - time.time()))
+            try:
+                await session.refresh_token(
+                    session.metadata["token_endpoint"],
+                    refresh_token=session.token["refresh_token"],
+                )
+                logger.info("Schwab access token refreshed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Schwab token refresh failed: {e}; retrying in 30s")
+                await asyncio.sleep(30)
+
+    async def _run_quote_stream(self, symbols: list[str]):
+        """Hold a LEVELONE_EQUITIES subscription open, reconnecting on errors.
+
+        While connected, get_quote serves these symbols from the pushed
+        updates instead of polling REST.
+        """
+        while True:
+            try:
+                stream = schwab.streaming.StreamClient(self._client)
+                stream.add_level_one_equity_handler(self._on_level_one_equity)
+                await stream.login()
+                await stream.level_one_equity_subs(symbols)
+                self._stream_client = stream
+                logger.info(f"Streaming level one quotes for {', '.join(symbols)}")
+                while True:
+                    await stream.handle_message()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Quote stream error: {e}; reconnecting in {STREAM_RECONNECT_SEC:.0f}s")
+            # Never serve quotes frozen at the moment the stream died
+            self._stream_client = None
+            self._stream_fields.clear()
+            self._stream_quotes.clear()
+            await asyncio.sleep(STREAM_RECONNECT_SEC)
+
+    def _on_level_one_equity(self, msg: dict):
+        # Updates only carry the fields that changed; merge onto the last state
+        for entry in msg.get("content", []):
+            symbol = entry.get("key")
+            if not symbol:
+                continue
+            fields = self._stream_fields.setdefault(symbol, {})
+            fields.update(entry)
+            # Until a trade price arrives get_quote keeps using REST
+            if fields.get("LAST_PRICE") is None:
+                continue
+            self._stream_quotes[symbol] = {
+                "symbol": symbol,
+                "last": fields.get("LAST_PRICE"),
+                "bid": fields.get("BID_PRICE"),
+                "ask": fields.get("ASK_PRICE"),
+                "volume": fields.get("TOTAL_VOLUME"),
+                "timestamp": _utc_iso_now(),
+            }
+
+    @staticmethod
+    def _parse_quote(symbol: str, data: dict) -> dict:
+        quote = data.get(symbol, {}).get("quote", {})
+        return {
+            "symbol": symbol,
+            "last": quote.get("lastPrice"),
+            "bid": quote.get("bidPrice"),
+            "ask": quote.get("askPrice"),
+            "volume": quote.get("totalVolume"),
+            "timestamp": _utc_iso_now(),
+        }
+
+    def invalidate(self):
+        """Drop all cached responses so the next calls go to the API."""
+        self._cache.clear()
+
+    async def get_quote(
+        self, symbol: str = "SPY", force_refresh: bool = False,
+    ) -> Optional[dict]:
         if not self._client:
             return None
+        key = f"quote:{symbol}"
+        if not force_refresh:
+            streamed = self._stream_quotes.get(symbol)
+            if streamed is not None:
+                return streamed
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+        if self._quote_queue is not None:
+            fut = asyncio.get_running_loop().create_future()
+            self._quote_queue.put_nowait((symbol, fut))
+            return await fut
         try:
-            resp = self._client.get_quote(symbol)
+            resp = await self._call(self._client.get_quote, symbol)
             if resp.status_code == 200:
-                data = resp.json()
-                quote = data.get(symbol, {}).get("quote", {})
-                return {
-                    "symbol": symbol,
-                    "last": quote.get("lastPrice"),
-                    "bid": quote.get("bidPrice"),
-                    "ask": quote.get("askPrice"),
-                    "volume": quote.get("totalVolume"),
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                }
+                quote = self._parse_quote(symbol, response_json(resp))
+                self._cache.set(key, quote, settings.schwab_quote_ttl_sec)
+                return quote
         except Exception as e:
             logger.error(f"Error getting quote: {e}")
         return None
 
-    async def get_account_info(self) -> Optional[dict]:
+    async def get_quotes(self, symbols: Sequence[str]) -> Optional[dict[str, dict]]:
+        """Quotes for several symbols in one request, keyed by symbol."""
+        if not self._client:
+            return None
+        try:
+            resp = await self._call(self._client.get_quotes, list(symbols))
+            if resp.status_code == 200:
+                data = response_json(resp)
+                return {s: self._parse_quote(s, data) for s in symbols if s in data}
+        except Exception as e:
+            logger.error(f"Error getting quotes: {e}")
+        return None
+
+    async def _quote_batcher(self):
+        """Serve queued get_quote requests with one get_quotes call per batch.
+
+        Waits for a request, then collects up to QUOTE_BATCH_MAX more for at
+        most QUOTE_BATCH_WINDOW_SEC before hitting the API.
+        """
+        queue = self._quote_queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + QUOTE_BATCH_WINDOW_SEC
+            while len(batch) <= QUOTE_BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            quotes = {}
+            try:
+                fetched = await self.get_quotes(list(dict.fromkeys(s for s, _ in batch)))
+                if fetched:
+                    quotes = fetched
+                    ttl = settings.schwab_quote_ttl_sec
+                    for symbol, quote in quotes.items():
+                        self._cache.set(f"quote:{symbol}", quote, ttl)
+            finally:
+                # Also on cancellation: these futures have left the queue, so
+                # aclose() can no longer reach their get_quote callers
+                for symbol, fut in batch:
+                    if not fut.done():
+                        fut.set_result(quotes.get(symbol))
+
+    async def get_snapshot(self, symbols: Sequence[str] = ("SPY",)) -> Optional[dict]:
+        """Quotes and account info, fetched concurrently so the two requests
+        overlap instead of paying two sequential round trips."""
+        if not self._client:
+            return None
+        quotes, account = await asyncio.gather(
+            self.get_quotes(symbols), self.get_account_info(),
+        )
+        return {"quotes": quotes or {}, "account": account}
+
+    async def warmup(self, symbol: str = "SPY"):
+        """Prime the quote, price-history and option-chain caches for `symbol`.
+
+        The three requests run concurrently over the session's keep-alive
+        pool, so warmup costs about one round trip instead of three.
+        """
+        if not self._client:
+            return
+        await asyncio.gather(
+            self.get_quote(symbol, force_refresh=True),
+            self.get_price_history(symbol, force_refresh=True),
+            self.get_option_chain(symbol, force_refresh=True),
+        )
+
+    async def get_account_info(self, force_refresh: bool = False) -> Optional[dict]:
         if not self._client or not self._account_hash:
             return None
+        if not force_refresh:
+            cached = self._cache.get("account")
+            if cached is not None:
+                return cached
         try:
-            resp = self._client.get_account(
+            resp = await self._call(
+                self._client.get_account,
                 self._account_hash,
                 fields=["positions"],
             )
             if resp.status_code == 200:
-                data = resp.json()
+                data = response_json(resp)
                 acct = data.get("securitiesAccount", {})
                 balances = acct.get("currentBalances", {})
-                return {
+                info = {
                     "equity": balances.get("liquidationValue", 0),
                     "cash": balances.get("cashBalance", 0),
                     "buying_power": balances.get("buyingPower", 0),
                     "positions": acct.get("positions", []),
                 }
+                self._cache.set("account", info, settings.schwab_account_ttl_sec)
+                return info
         except Exception as e:
             logger.error(f"Error getting account info: {e}")
         return None
 
+    def _unknown_order(self, client_order_id: str, error: str) -> dict:
+        logger.error(
+            f"Order {client_order_id} outcome unknown ({error}); "
+            f"not resending until reconcile_order() settles it"
+        )
+        return {"order_id": None, "status": "UNKNOWN", "error": error,
+                "client_order_id": client_order_id}
+
+    async def _place_once(
+        self, client_order_id: Optional[str], spec: dict, label: str, placed_msg: str = "",
+    ) -> Optional[dict]:
+        """POST `spec` at most once per client_order_id.
+
+        The key is reserved with an in-flight future before the request, so
+        concurrent same-key callers wait for that result instead of sending.
+        Afterwards the key maps to the accepted order (for
+        ORDER_DEDUPE_TTL_SEC) or, when the broker may have accepted it
+        without us seeing the response (5xx, read timeout, cancellation), to
+        an UNKNOWN result kept until reconcile_order(). The key is released
+        only when the order definitely did not go through: a 4xx rejection
+        or a transport error raised before the request was sent.
+
+        Without a client_order_id a fresh key is generated. Its accepted
+        result is not kept, since nothing can repeat the key, but an UNKNOWN
+        outcome still is: the key is returned and a retry may reuse it.
+        """
+        caller_key = client_order_id is not None
+        client_order_id = client_order_id or uuid.uuid4().hex
+        entry = self._order_dedupe.get(client_order_id)
+        if isinstance(entry, asyncio.Future):
+            logger.warning(f"{label} {client_order_id} already in flight; waiting for its result")
+            return await asyncio.shield(entry)
+        if entry is not None:
+            logger.warning(f"{label} {client_order_id} already submitted ({entry['status']}); not resending")
+            return entry
+
+        pending = asyncio.get_running_loop().create_future()
+        self._order_dedupe.set(client_order_id, pending, math.inf)
+        result = None
+        try:
+            resp = await self._call(
+                self._client.place_order, self._account_hash, spec, idempotent=False,
+            )
+            status = resp.status_code
+            if status in (200, 201):
+                self._cache.discard("account")
+                order_id = resp.headers.get("Location", "").split("/")[-1]
+                if placed_msg:
+                    logger.info(f"{label} placed: {order_id} {placed_msg}")
+                result = {"order_id": order_id, "status": "FILLED",
+                          "client_order_id": client_order_id}
+            elif 400 <= status < 500:
+                logger.error(f"{label} failed: {status} {resp.text}")
+                result = {"order_id": None, "status": "FAILED", "error": resp.text,
+                          "client_order_id": client_order_id}
+            else:
+                result = self._unknown_order(client_order_id, f"HTTP {status}")
+        except _UNSENT_ERRORS as e:
+            logger.error(f"Error placing {label.lower()}: {e}")
+        except asyncio.CancelledError:
+            result = self._unknown_order(client_order_id, "cancelled awaiting the response")
+            raise
+        except Exception as e:
+            result = self._unknown_order(client_order_id, repr(e))
+        finally:
+            if result is not None and result["status"] == "UNKNOWN":
+                self._order_dedupe.set(client_order_id, result, math.inf)
+            elif result is not None and result["status"] == "FILLED" and caller_key:
+                self._order_dedupe.set(client_order_id, result, ORDER_DEDUPE_TTL_SEC)
+            else:
+                self._order_dedupe.discard(client_order_id)
+            pending.set_result(result)
+        return result
+
+    def reconcile_order(self, client_order_id: str, order_id: Optional[str] = None):
+        """Settle an UNKNOWN order after checking it at the broker.
+
+        With the broker's order_id the key records the order as placed, so
+        retries keep returning it; with None the order never arrived and the
+        key is released for a resend.
+        """
+        entry = self._order_dedupe.get(client_order_id)
+        if entry is None or isinstance(entry, asyncio.Future) or entry["status"] != "UNKNOWN":
+            return
+        if order_id is None:
+            self._order_dedupe.discard(client_order_id)
+        else:
+            self._order_dedupe.set(
+                client_order_id,
+                {"order_id": order_id, "status": "FILLED", "client_order_id": client_order_id},
+                ORDER_DEDUPE_TTL_SEC,
+            )
+
     async def place_order(
         self,
         symbol: str,
@@ -102,27 +686,19 @@ class SchwabClient:
         side: str,  # "BUY" or "SELL"
         order_type: str = "MARKET",
         price: Optional[float] = None,
+        client_order_id: Optional[str] = None,
     ) -> Optional[dict]:
         if not self._client or not self._account_hash:
             return None
         try:
-            from schwab.orders.equities import equity_buy_market, equity_sell_market
-
             if side == "BUY":
                 order = equity_buy_market(symbol, quantity)
             else:
                 order = equity_sell_market(symbol, quantity)
-
-            resp = self._client.place_order(self._account_hash, order)
-            if resp.status_code in (200, 201):
-                order_id = resp.headers.get("Location", "").split("/")[-1]
-                return {"order_id": order_id, "status": "FILLED"}
-            else:
-                logger.error(f"Order failed: {resp.status_code} {resp.text}")
-                return {"order_id": None, "status": "FAILED", "error": resp.text}
         except Exception as e:
             logger.error(f"Error placing order: {e}")
             return None
+        return await self._place_once(client_order_id, order, "Order")
 
     async def place_bracket_order(
         self,
@@ -132,6 +708,7 @@ class SchwabClient:
         stop_loss: float,
         take_profit: float,
         trailing_stop_pct: Optional[float] = None,
+        client_order_id: Optional[str] = None,
     ) -> Optional[dict]:
         """Place a bracket order (OTO): market entry + stop loss + take profit.
 
@@ -140,79 +717,35 @@ class SchwabClient:
         if not self._client or not self._account_hash:
             return None
         try:
-            from schwab.orders.equities import equity_buy_market, equity_sell_market
-            from schwab.orders.common import OrderType, Session, Duration, one_cancels_other
-
-            # Primary leg: market order
-            if side == "BUY":
-                primary = equity_buy_market(symbol, quantity)
-                # Exit side for children
-                exit_side_stop = equity_sell_market(symbol, quantity)
-                exit_side_tp = equity_sell_market(symbol, quantity)
-            else:
-                primary = equity_sell_market(symbol, quantity)
-                exit_side_stop = equity_buy_market(symbol, quantity)
-                exit_side_tp = equity_buy_market(symbol, quantity)
-
-            # Build stop loss child order
-            from schwab.orders.equities import equity_buy_limit, equity_sell_limit
-            from schwab.orders.common import StopPriceLinkBasis, StopPriceLinkType
-
-            # Stop loss order
+            exit_legs = _equity_legs("SELL" if side == "BUY" else "BUY", quantity, symbol)
             stop_order_spec = {
-                "orderType": "STOP",
-                "session": "NORMAL",
-                "duration": "DAY",
+                **_STOP_PROTO,
                 "stopPrice": str(round(stop_loss, 2)),
-                "orderLegCollection": [{
-                    "instruction": "SELL" if side == "BUY" else "BUY",
-                    "quantity": quantity,
-                    "instrument": {"symbol": symbol, "assetType": "EQUITY"},
-                }],
+                "orderLegCollection": exit_legs,
             }
-
-            # Take profit order (limit)
             tp_order_spec = {
-                "orderType": "LIMIT",
-                "session": "NORMAL",
-                "duration": "DAY",
+                **_LIMIT_PROTO,
                 "price": str(round(take_profit, 2)),
-                "orderLegCollection": [{
-                    "instruction": "SELL" if side == "BUY" else "BUY",
-                    "quantity": quantity,
-                    "instrument": {"symbol": symbol, "assetType": "EQUITY"},
-                }],
+                "orderLegCollection": exit_legs,
             }
 
             # Build OTO bracket: primary triggers OCO(stop, target)
             bracket_spec = {
-                "orderType": "MARKET",
-                "session": "NORMAL",
-                "duration": "DAY",
+                **_MARKET_PROTO,
                 "orderStrategyType": "TRIGGER",
-                "orderLegCollection": [{
-                    "instruction": side,
-                    "quantity": quantity,
-                    "instrument": {"symbol": symbol, "assetType": "EQUITY"},
-                }],
+                "orderLegCollection": _equity_legs(side, quantity, symbol),
                 "childOrderStrategies": [{
                     "orderStrategyType": "OCO",
                     "childOrderStrategies": [stop_order_spec, tp_order_spec],
                 }],
             }
-
-            resp = self._client.place_order(self._account_hash, bracket_spec)
-            if resp.status_code in (200, 201):
-                order_id = resp.headers.get("Location", "").split("/")[-1]
-                logger.info(f"Bracket order placed: {order_id} ({side} {quantity} {symbol} "
-                            f"SL={stop_loss} TP={take_profit})")
-                return {"order_id": order_id, "status": "FILLED"}
-            else:
-                logger.error(f"Bracket order failed: {resp.status_code} {resp.text}")
-                return {"order_id": None, "status": "FAILED", "error": resp.text}
         except Exception as e:
             logger.error(f"Error placing bracket order: {e}")
             return None
+        return await self._place_once(
+            client_order_id, bracket_spec, "Bracket order",
+            placed_msg=f"({side} {quantity} {symbol} SL={stop_loss} TP={take_profit})",
+        )
 
     async def place_trailing_stop(
         self,
@@ -226,21 +759,16 @@ class SchwabClient:
             return None
         try:
             trailing_spec = {
-                "orderType": "TRAILING_STOP",
-                "session": "NORMAL",
-                "duration": "DAY",
-                "stopPriceLinkBasis": "LAST",
-                "stopPriceLinkType": "PERCENT",
+                **_TRAILING_STOP_PROTO,
                 "stopPriceOffset": str(round(trail_pct, 2)),
-                "orderLegCollection": [{
-                    "instruction": side,
-                    "quantity": quantity,
-                    "instrument": {"symbol": symbol, "assetType": "EQUITY"},
-                }],
+                "orderLegCollection": _equity_legs(side, quantity, symbol),
             }
 
-            resp = self._client.place_order(self._account_hash, trailing_spec)
+            resp = await self._call(
+                self._client.place_order, self._account_hash, trailing_spec, idempotent=False,
+            )
             if resp.status_code in (200, 201):
+                self._cache.discard("account")
                 order_id = resp.headers.get("Location", "").split("/")[-1]
                 logger.info(f"Trailing stop placed: {order_id} ({side} {quantity} {symbol} trail={trail_pct}%)")
                 return {"order_id": order_id, "status": "PLACED"}
@@ -256,8 +784,9 @@ class SchwabClient:
         if not self._client or not self._account_hash:
             return False
         try:
-            resp = self._client.cancel_order(order_id, self._account_hash)
+            resp = await self._call(self._client.cancel_order, order_id, self._account_hash)
             if resp.status_code in (200, 201):
+                self._cache.discard("account")
                 logger.info(f"Order {order_id} cancelled")
                 return True
             else:
@@ -272,8 +801,12 @@ class SchwabClient:
         if not self._client or not self._account_hash:
             return None
         try:
-            resp = self._client.replace_order(self._account_hash, order_id, new_order)
+            resp = await self._call(
+                self._client.replace_order, self._account_hash, order_id, new_order,
+                idempotent=False,
+            )
             if resp.status_code in (200, 201):
+                self._cache.discard("account")
                 new_id = resp.headers.get("Location", "").split("/")[-1]
                 logger.info(f"Order {order_id} replaced with {new_id}")
                 return {"order_id": new_id, "status": "REPLACED"}
@@ -291,19 +824,27 @@ class SchwabClient:
         period: int = 1,
         frequency_type: str = "minute",
         frequency: int = 1,
+        force_refresh: bool = False,
     ) -> Optional[list]:
         if not self._client:
             return None
+        key = f"price_history:{symbol}"
+        if not force_refresh:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
         try:
-            from schwab.client import Client
-            resp = self._client.get_price_history_every_minute(
+            price_history = schwab.client.Client.PriceHistory
+            resp = await self._call(
+                self._client.get_price_history_every_minute,
                 symbol,
-                period_type=Client.PriceHistory.PeriodType.DAY,
-                period=Client.PriceHistory.Period.ONE_DAY,
+                period_type=price_history.PeriodType.DAY,
+                period=price_history.Period.ONE_DAY,
             )
             if resp.status_code == 200:
-                data = resp.json()
-                return data.get("candles", [])
+                candles = response_json(resp).get("candles", [])
+                self._cache.set(key, candles, settings.schwab_price_history_ttl_sec)
+                return candles
         except Exception as e:
             logger.error(f"Error getting price history: {e}")
         return None
@@ -314,10 +855,16 @@ class SchwabClient:
         contract_type: Optional[str] = None,
         strike_count: int = 30,
         dte_range: Optional[tuple[int, int]] = None,
+        force_refresh: bool = False,
     ) -> Optional[dict]:
         """Fetch option chain from Schwab API."""
         if not self._client:
             return None
+        key = f"option_chain:{symbol}:{contract_type}:{strike_count}:{dte_range}"
+        if not force_refresh:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
         try:
             kwargs = {"symbol": symbol, "strike_count": strike_count}
             if dte_range:
@@ -325,9 +872,11 @@ class SchwabClient:
                 to_date = datetime.now() + timedelta(days=dte_range[1])
                 kwargs["from_date"] = from_date
                 kwargs["to_date"] = to_date
-            resp = self._client.get_option_chain(**kwargs)
+            resp = await self._call(self._client.get_option_chain, **kwargs)
             if resp.status_code == 200:
-                return resp.json()
+                chain = response_json(resp)
+                self._cache.set(key, chain, settings.schwab_option_chain_ttl_sec)
+                return chain
         except Exception as e:
             logger.error(f"Error getting option chain: {e}")
         return None
@@ -341,18 +890,16 @@ class SchwabClient:
             return None
 
         try:
-            from app.services.options.models import OptionsStrategyType, OptionAction
-
-            strategy_type = order.strategy_type
-            legs = order.legs
-
             # Build order spec based on strategy type
             order_spec = self._build_options_order_spec(order)
             if order_spec is None:
                 return None
 
-            resp = self._client.place_order(self._account_hash, order_spec)
+            resp = await self._call(
+                self._client.place_order, self._account_hash, order_spec, idempotent=False,
+            )
             if resp.status_code in (200, 201):
+                self._cache.discard("account")
                 order_id = resp.headers.get("Location", "").split("/")[-1]
                 logger.info(f"Options order placed: {order_id} ({order.to_display_string()})")
                 return {"order_id": order_id, "status": "FILLED"}
@@ -365,29 +912,12 @@ class SchwabClient:
 
     def _build_options_order_spec(self, order) -> Optional[dict]:
         """Build Schwab order spec for an options order."""
-        from app.services.options.models import OptionAction
-
-        legs_spec = []
-        for leg in order.legs:
-            instruction = "SELL_TO_OPEN" if leg.action == OptionAction.SELL_TO_OPEN else "BUY_TO_OPEN"
-            legs_spec.append({
-                "instruction": instruction,
-                "quantity": leg.quantity,
-                "instrument": {
-                    "symbol": leg.contract_symbol,
-                    "assetType": "OPTION",
-                },
-            })
-
-        price = abs(order.net_premium)
-
         return {
             "orderType": "NET_CREDIT" if order.is_credit else "NET_DEBIT",
-            "session": "NORMAL",
-            "duration": "DAY",
-            "price": str(round(price, 2)),
-            "complexOrderStrategyType": "VERTICAL" if len(order.legs) == 2 else "IRON_CONDOR" if len(order.legs) == 4 else "SINGLE",
-            "orderLegCollection": legs_spec,
+            **_DAY_SESSION,
+            "price": str(round(abs(order.net_premium), 2)),
+            "complexOrderStrategyType": _COMPLEX_STRATEGY_BY_LEGS.get(len(order.legs), "SINGLE"),
+            "orderLegCollection": _option_legs(order.legs),
         }
 
     async def close_options_position(self, order) -> Optional[dict]:
@@ -396,34 +926,17 @@ class SchwabClient:
             return None
 
         try:
-            from app.services.options.models import OptionAction
-
-            legs_spec = []
-            for leg in order.legs:
-                # Reverse the action
-                if leg.action == OptionAction.SELL_TO_OPEN:
-                    instruction = "BUY_TO_CLOSE"
-                else:
-                    instruction = "SELL_TO_CLOSE"
-                legs_spec.append({
-                    "instruction": instruction,
-                    "quantity": leg.quantity,
-                    "instrument": {
-                        "symbol": leg.contract_symbol,
-                        "assetType": "OPTION",
-                    },
-                })
-
             close_spec = {
-                "orderType": "MARKET",
-                "session": "NORMAL",
-                "duration": "DAY",
-                "complexOrderStrategyType": "VERTICAL" if len(order.legs) == 2 else "IRON_CONDOR" if len(order.legs) == 4 else "SINGLE",
-                "orderLegCollection": legs_spec,
+                **_MARKET_PROTO,
+                "complexOrderStrategyType": _COMPLEX_STRATEGY_BY_LEGS.get(len(order.legs), "SINGLE"),
+                "orderLegCollection": _option_legs(order.legs, closing=True),
             }
 
-            resp = self._client.place_order(self._account_hash, close_spec)
+            resp = await self._call(
+                self._client.place_order, self._account_hash, close_spec, idempotent=False,
+            )
             if resp.status_code in (200, 201):
+                self._cache.discard("account")
                 order_id = resp.headers.get("Location", "").split("/")[-1]
                 logger.info(f"Options close order placed: {order_id}")
                 return {"order_id": order_id, "status": "FILLED"}
@@ -14,8 +14,10 @@ Exit: 2.0x ATR target | 1.5x ATR stop | ADX drops below 18 | EOD
 """
 
 from __future__ import annotations
+import math
 from datetime import datetime, time
 from typing import Optional
+import numpy as np
 import pandas as pd
 
 from app.services.strategies.base import (
@@ -23,6 +25,10 @@ from app.services.strategies.base import (
 )
 
 
+# Columns read by generate_signal, in unpacking order
+_SIGNAL_COLS = ("close", "adx", "plus_di", "minus_di", "ema9", "ema21", "rsi", "vwap", "atr")
+
+
 class ADXTrendStrategy(BaseStrategy):
     name = "adx_trend"
 
@@ -48,37 +54,33 @@ class ADXTrendStrategy(BaseStrategy):
             return None
 
         p   = self.params
-        row = df.iloc[idx]
 
         t   = current_time.time() if isinstance(current_time, datetime) else current_time
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t < time(10, 0) or t >= eod:
             return None
 
-        close    = row["close"]
-        adx      = row.get("adx")
-        plus_di  = row.get("plus_di")
-        minus_di = row.get("minus_di")
-        ema9     = row.get("ema9")
-        ema21    = row.get("ema21")
-        rsi      = row.get("rsi")
-        vwap     = row.get("vwap")
-        atr      = row.get("atr")
+        cols = self.bind(df)
+        arrays = [cols[c] for c in _SIGNAL_COLS]
+        if any(a is None for a in arrays):
+            return None
+        close, adx, plus_di, minus_di, ema9, ema21, rsi, vwap, atr = (a[idx] for a in arrays)
 
-        for val in [adx, plus_di, minus_di, ema9, ema21, rsi, vwap, atr]:
-            if val is None or (isinstance(val, float) and pd.isna(val)):
-                return None
+        if (math.isnan(adx) or math.isnan(plus_di) or math.isnan(minus_di)
+                or math.isnan(ema9) or math.isnan(ema21) or math.isnan(rsi)
+                or math.isnan(vwap) or math.isnan(atr)):
+            return None
 
         if adx < p["adx_min"]:
             return None
 
         # ADX must be rising — flat/falling ADX means trend is losing steam
-        prev_adx = df.iloc[idx - 1].get("adx")
-        if prev_adx is None or pd.isna(prev_adx) or float(adx) <= float(prev_adx):
+        prev_adx = arrays[1][idx - 1]
+        if math.isnan(prev_adx) or adx <= prev_adx:
             return None
 
         # DI gap confirms directional conviction (Wilder 1978)
-        di_gap = abs(float(plus_di) - float(minus_di))
+        di_gap = abs(plus_di - minus_di)
         if di_gap < p["di_gap_min"]:
             return None
 
@@ -116,6 +118,41 @@ class ADXTrendStrategy(BaseStrategy):
 
         return None
 
+    def generate_signals_bulk(self, df: pd.DataFrame) -> np.ndarray:
+        p = self.params
+        n = len(df)
+        out = np.zeros(n, dtype=np.int8)
+        if n <= 30:
+            return out
+        # Same bound arrays generate_signal/should_exit index into later
+        cols = self.bind(df)
+        arrays = [cols[c] for c in _SIGNAL_COLS]
+        if any(a is None for a in arrays):
+            return out
+        close, adx, plus_di, minus_di, ema9, ema21, rsi, vwap, atr = arrays
+        prev_adx = np.empty(n)
+        prev_adx[0] = np.nan
+        prev_adx[1:] = adx[:-1]
+
+        # Same gates as generate_signal; NaN compares False so only the
+        # inputs generate_signal rejects explicitly need an isnan check
+        base = ~(np.isnan(plus_di) | np.isnan(minus_di) | np.isnan(ema9)
+                 | np.isnan(ema21) | np.isnan(rsi) | np.isnan(vwap) | np.isnan(atr))
+        base &= adx >= p["adx_min"]
+        base &= adx > prev_adx
+        base &= np.abs(plus_di - minus_di) >= p["di_gap_min"]
+        base[:30] = False
+
+        long_mask = (base & (plus_di > minus_di) & (ema9 > ema21)
+                     & (rsi >= p["rsi_long_min"]) & (rsi <= p["rsi_long_max"])
+                     & (close > vwap))
+        short_mask = (base & (minus_di > plus_di) & (ema9 < ema21)
+                      & (rsi >= p["rsi_short_min"]) & (rsi <= p["rsi_short_max"])
+                      & (close < vwap))
+        out[long_mask] = 1
+        out[short_mask] = -1
+        return out
+
     def should_exit(
         self,
         df: pd.DataFrame,
@@ -126,42 +163,71 @@ class ADXTrendStrategy(BaseStrategy):
         highest_since_entry: float,
         lowest_since_entry: float,
     ) -> Optional[ExitSignal]:
-        p   = self.params
-        row = df.iloc[idx]
-        close = row["close"]
-        atr   = row.get("atr", 0) or 0
+        p    = self.params
+        cols = self.bind(df)
+        close = cols["close"][idx]
+        atr_col = cols["atr"]
+        adx_col = cols["adx"]
 
         t   = current_time.time() if isinstance(current_time, datetime) else current_time
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t >= eod:
             return ExitSignal(ExitReason.EOD, close, current_time)
 
-        is_long = trade.direction == Direction.LONG
-
-        if is_long and close <= trade.stop_loss:
-            return ExitSignal(ExitReason.STOP_LOSS, trade.stop_loss, current_time)
-        if not is_long and close >= trade.stop_loss:
-            return ExitSignal(ExitReason.STOP_LOSS, trade.stop_loss, current_time)
-
-        if is_long and close >= trade.take_profit:
-            return ExitSignal(ExitReason.TAKE_PROFIT, trade.take_profit, current_time)
-        if not is_long and close <= trade.take_profit:
-            return ExitSignal(ExitReason.TAKE_PROFIT, trade.take_profit, current_time)
-
-        # Exit if ADX weakens significantly (trend fading)
-        adx = row.get("adx")
-        if adx is not None and not pd.isna(adx) and adx < p["adx_exit"]:
-            return ExitSignal(ExitReason.REVERSE_SIGNAL, close, current_time)
-
-        # Trailing stop
-        trail = p["atr_trailing_mult"] * atr
-        if is_long:
-            ts = highest_since_entry - trail
-            if ts > trade.stop_loss and close <= ts:
-                return ExitSignal(ExitReason.TRAILING_STOP, close, current_time)
-        else:
-            ts = lowest_since_entry + trail
-            if ts < trade.stop_loss and close >= ts:
-                return ExitSignal(ExitReason.TRAILING_STOP, close, current_time)
-
-        return None
+        hit = _exit_decision(
+            float(close),
+            0.0 if atr_col is None else float(atr_col[idx]),
+            math.nan if adx_col is None else float(adx_col[idx]),
+            trade.direction == Direction.LONG, trade.stop_loss, trade.take_profit,
+            p["adx_exit"], p["atr_trailing_mult"],
+            highest_since_entry, lowest_since_entry,
+        )
+        if hit is None:
+            return None
+        return ExitSignal(hit[0], hit[1], current_time)
+
+
+def _exit_decision(
+    close: float,
+    atr: float,
+    adx: float,
+    is_long: bool,
+    stop_loss: float,
+    take_profit: float,
+    adx_exit: float,
+    trail_mult: float,
+    highest: float,
+    lowest: float,
+) -> Optional[tuple[ExitReason, float]]:
+    """Bar-level exit rules on plain floats; returns (reason, exit price).
+
+    A NaN adx or atr compares False everywhere, which disables the ADX-fade
+    and trailing-stop rules for that bar.
+    """
+    if is_long:
+        if close <= stop_loss:
+            return ExitReason.STOP_LOSS, stop_loss
+        if close >= take_profit:
+            return ExitReason.TAKE_PROFIT, take_profit
+    else:
+        if close >= stop_loss:
+            return ExitReason.STOP_LOSS, stop_loss
+        if close <= take_profit:
+            return ExitReason.TAKE_PROFIT, take_profit
+
+    # Exit if ADX weakens significantly (trend fading)
+    if adx < adx_exit:
+        return ExitReason.REVERSE_SIGNAL, close
+
+    # Trailing stop
+    trail = trail_mult * atr
+    if is_long:
+        ts = highest - trail
+        if ts > stop_loss and close <= ts:
+            return ExitReason.TRAILING_STOP, close
+    else:
+        ts = lowest + trail
+        if ts < stop_loss and close >= ts:
+            return ExitReason.TRAILING_STOP, close
+
+    return None
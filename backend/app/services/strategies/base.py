@@ -1,9 +1,10 @@
 """Base strategy abstract class and TradeSignal dataclass."""
 
 from __future__ import annotations
+import math
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, time
 from enum import Enum
 from typing import Optional
 import pandas as pd
@@ -30,7 +31,7 @@ class ExitReason(str, Enum):
     ADAPTIVE_TRAILING = "adaptive_trailing"
 
 
-@dataclass
+@dataclass(slots=True)
 class ScaleLevel:
     """Defines a scale-out level for partial position exits."""
     pct_to_close: float              # fraction of original qty to close (e.g. 0.50)
@@ -55,7 +56,7 @@ class MarketContext:
     vix_daily_move_pct: float = 1.25  # VIX/16 = 1-sigma daily expected move % (e.g. VIX=20 → 1.25%)
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeSignal:
     strategy: str
     direction: Direction
@@ -68,7 +69,7 @@ class TradeSignal:
     metadata: dict = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExitSignal:
     reason: ExitReason
     exit_price: float
@@ -76,6 +77,54 @@ class ExitSignal:
     quantity: Optional[int] = None  # None = close entire position
 
 
+def _any_nan(*vals) -> bool:
+    """True if any value is None or a float NaN.
+
+    Same test as `val is None or (isinstance(val, float) and pd.isna(val))`
+    without the pandas dispatch; non-float values such as pd.NA pass.
+    """
+    for v in vals:
+        if v is None or (isinstance(v, float) and math.isnan(v)):
+            return True
+    return False
+
+
+class _FrameColumns(dict):
+    """Float64 column arrays of one DataFrame, materialised on first access.
+
+    Missing columns map to None. Holding the frame keeps its identity stable
+    for the `is` check in BaseStrategy.bind.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        super().__init__()
+        self.df = df
+
+    def __missing__(self, col: str) -> Optional[np.ndarray]:
+        arr = self.df[col].to_numpy(dtype=float) if col in self.df.columns else None
+        self[col] = arr
+        return arr
+
+
+def _last_row_values(df: Optional[pd.DataFrame], cols: tuple[str, ...]) -> dict:
+    """Last-row values of `cols` as floats, None for columns `df` lacks.
+
+    Reads each column's array directly instead of building a df.iloc[-1]
+    Series. Returns {} for a missing or empty frame.
+    """
+    if df is None or df.empty:
+        return {}
+    columns = df.columns
+    return {c: float(df[c].to_numpy()[-1]) if c in columns else None for c in cols}
+
+
+# Last-row columns compute_confluence_score reads from each timeframe
+_CONFLUENCE_COLS_1MIN = ("ema9", "ema21", "vol_ratio", "close", "vwap", "bb_upper", "bb_lower")
+_CONFLUENCE_COLS_1HR = ("ema9", "ema21", "macd_hist", "adx", "plus_di", "minus_di")
+_CONFLUENCE_COLS_4HR = ("ema9", "ema21", "macd_hist")
+_CONFLUENCE_COLS_EMA = ("ema9", "ema21")
+
+
 class BaseStrategy(ABC):
     """Abstract base for all trading strategies."""
 
@@ -83,6 +132,18 @@ class BaseStrategy(ABC):
 
     def __init__(self, params: Optional[dict] = None):
         self.params = params or self.default_params()
+        self._bound: Optional[_FrameColumns] = None
+
+    @property
+    def params(self) -> dict:
+        return self._params
+
+    @params.setter
+    def params(self, value: dict):
+        self._params = value
+        # Parsed here instead of on every bar; reassigning params re-parses
+        eod = value.get("eod_exit_time")
+        self._eod: Optional[time] = time(*[int(x) for x in eod.split(":")]) if eod else None
 
     @abstractmethod
     def default_params(self) -> dict:
@@ -109,6 +170,28 @@ class BaseStrategy(ABC):
         """Check if exit conditions are met for an open trade."""
         ...
 
+    def bind(self, df: pd.DataFrame) -> _FrameColumns:
+        """Column arrays of `df` for positional reads in the per-bar hot path.
+
+        Cached until a different frame is passed (new backtest run or live
+        data refresh), so `cols["close"][idx]` replaces building a row Series
+        with df.iloc[idx]. Arrays are views for float columns, not copies.
+        """
+        cols = self._bound
+        if cols is None or cols.df is not df:
+            cols = self._bound = _FrameColumns(df)
+        return cols
+
+    def generate_signals_bulk(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+        """Vectorised pre-screen of generate_signal over every bar of `df`.
+
+        Returns an int8 array (+1 long candidate, -1 short, 0 none), or None
+        when the strategy has no bulk path. Only non-zero rows can produce a
+        signal; callers still run generate_signal on them, which applies the
+        time-of-day gate and builds the TradeSignal.
+        """
+        return None
+
     @staticmethod
     def compute_confluence_score(ctx: MarketContext, direction: Direction) -> float:
         """Compute multi-timeframe confluence score (0-100).
@@ -121,33 +204,39 @@ class BaseStrategy(ABC):
         score = 0.0
         sign = 1.0 if direction == Direction.LONG else -1.0
 
+        # One read of the last row per timeframe, shared by every section
+        last_1min = _last_row_values(ctx.df_1min, _CONFLUENCE_COLS_1MIN)
+        last_1hr = _last_row_values(ctx.df_1hr, _CONFLUENCE_COLS_1HR)
+        last_4hr = _last_row_values(ctx.df_4hr, _CONFLUENCE_COLS_4HR)
+
         # ── 1. Trend alignment across timeframes (60 pts total) ──
         tf_weights = [
-            (ctx.df_4hr, 25.0),
-            (ctx.df_1hr, 20.0),
-            (ctx.df_30min, 15.0),
-            (ctx.df_15min, 12.0),
-            (ctx.df_5min, 5.0),
-            (ctx.df_1min, 3.0),
+            (ctx.df_4hr, last_4hr, 25.0),
+            (ctx.df_1hr, last_1hr, 20.0),
+            (ctx.df_30min, None, 15.0),
+            (ctx.df_15min, None, 12.0),
+            (ctx.df_5min, None, 5.0),
+            (ctx.df_1min, last_1min, 3.0),
         ]
-        for df_tf, weight in tf_weights:
+        for df_tf, last, weight in tf_weights:
             if df_tf is None or df_tf.empty or len(df_tf) < 5:
                 continue
-            row = df_tf.iloc[-1]
-            ema9 = row.get("ema9")
-            ema21 = row.get("ema21")
-            if ema9 is not None and ema21 is not None and not pd.isna(ema9) and not pd.isna(ema21):
+            if last is None:
+                last = _last_row_values(df_tf, _CONFLUENCE_COLS_EMA)
+            ema9 = last["ema9"]
+            ema21 = last["ema21"]
+            if ema9 is not None and ema21 is not None and not math.isnan(ema9) and not math.isnan(ema21):
                 if (ema9 > ema21 and sign > 0) or (ema9 < ema21 and sign < 0):
                     score += weight
                 elif (ema9 < ema21 and sign > 0) or (ema9 > ema21 and sign < 0):
                     score -= weight * 0.5  # Penalize counter-trend
 
         # ── 2. Volume confirmation (10 pts) ──
-        if ctx.df_1min is not None and not ctx.df_1min.empty:
-            row_1m = ctx.df_1min.iloc[-1]
-            vol_ratio = row_1m.get("vol_ratio", 1.0)
-            if vol_ratio is not None and not pd.isna(vol_ratio):
-                vol_ratio = float(vol_ratio)
+        if last_1min:
+            vol_ratio = last_1min["vol_ratio"]
+            if vol_ratio is None:
+                vol_ratio = 1.0
+            if not math.isnan(vol_ratio):
                 if vol_ratio >= 1.5:
                     score += 10.0
                 elif vol_ratio >= 1.2:
@@ -156,12 +245,10 @@ class BaseStrategy(ABC):
                     score += 3.0
 
         # ── 3. Key level proximity — VWAP alignment (10 pts) ──
-        if ctx.df_1min is not None and not ctx.df_1min.empty:
-            row_1m = ctx.df_1min.iloc[-1]
-            close = row_1m.get("close")
-            vwap = row_1m.get("vwap")
-            if close is not None and vwap is not None and not pd.isna(close) and not pd.isna(vwap):
-                close, vwap = float(close), float(vwap)
+        if last_1min:
+            close = last_1min["close"]
+            vwap = last_1min["vwap"]
+            if close is not None and vwap is not None and not math.isnan(close) and not math.isnan(vwap):
                 if (close > vwap and sign > 0) or (close < vwap and sign < 0):
                     score += 10.0
                 elif (close < vwap and sign > 0) or (close > vwap and sign < 0):
@@ -170,10 +257,12 @@ class BaseStrategy(ABC):
         # ── 4. Volatility regime check (10 pts) ──
         # Avoid extremes: top 5% or bottom 5% of ATR percentile rank
         if ctx.df_1hr is not None and not ctx.df_1hr.empty and len(ctx.df_1hr) > 20:
-            atr_series = ctx.df_1hr["atr"].dropna()
-            if len(atr_series) > 10:
-                current_atr = float(atr_series.iloc[-1])
-                pct_rank = (atr_series < current_atr).sum() / len(atr_series)
+            atr_arr = ctx.df_1hr["atr"].to_numpy(dtype=float)
+            atr_arr = atr_arr[~np.isnan(atr_arr)]
+            if atr_arr.size > 10:
+                current_atr = atr_arr[-1]
+                # Left insertion point in the sorted values = count strictly below current
+                pct_rank = np.searchsorted(np.sort(atr_arr), current_atr) / atr_arr.size
                 if 0.05 <= pct_rank <= 0.95:
                     score += 10.0
                 elif 0.10 <= pct_rank <= 0.90:
@@ -181,13 +270,12 @@ class BaseStrategy(ABC):
                 # Extreme volatility: no bonus (score += 0)
 
         # ── 5. MACD confirmation across higher TFs (10 pts) ──
-        htf_macd = [(ctx.df_1hr, 5.0), (ctx.df_4hr, 5.0)]
-        for df_tf, weight in htf_macd:
-            if df_tf is None or df_tf.empty:
+        for last, weight in [(last_1hr, 5.0), (last_4hr, 5.0)]:
+            if not last:
                 continue
-            macd_hist = df_tf.iloc[-1].get("macd_hist")
-            if macd_hist is not None and not pd.isna(macd_hist):
-                if (float(macd_hist) > 0 and sign > 0) or (float(macd_hist) < 0 and sign < 0):
+            macd_hist = last["macd_hist"]
+            if macd_hist is not None and not math.isnan(macd_hist):
+                if (macd_hist > 0 and sign > 0) or (macd_hist < 0 and sign < 0):
                     score += weight
 
         # ── 6. RSI momentum alignment across 1hr and 4hr (8 pts) ──
@@ -196,13 +284,11 @@ class BaseStrategy(ABC):
         for df_tf, weight in [(ctx.df_1hr, 5.0), (ctx.df_4hr, 3.0)]:
             if df_tf is None or df_tf.empty or len(df_tf) < 3:
                 continue
-            rsi_cur = df_tf.iloc[-1].get("rsi")
-            rsi_prev = df_tf.iloc[-2].get("rsi")
-            if rsi_cur is None or rsi_prev is None:
+            if "rsi" not in df_tf.columns:
                 continue
-            if pd.isna(rsi_cur) or pd.isna(rsi_prev):
+            rsi_prev, rsi_cur = df_tf["rsi"].to_numpy()[-2:].tolist()
+            if math.isnan(rsi_cur) or math.isnan(rsi_prev):
                 continue
-            rsi_cur, rsi_prev = float(rsi_cur), float(rsi_prev)
             rising = rsi_cur > rsi_prev
             if sign > 0 and rising and rsi_cur < 60:   # LONG: RSI rising, not overbought
                 score += weight
@@ -216,17 +302,15 @@ class BaseStrategy(ABC):
         # ── 7. ADX trend strength on 1hr (6 pts) ──
         # Strong trend (ADX > 25) confirms breakout/momentum strategies.
         # In range (ADX < 20), mean-reversion is more reliable — penalize breakouts.
-        if ctx.df_1hr is not None and not ctx.df_1hr.empty:
-            adx = ctx.df_1hr.iloc[-1].get("adx")
-            plus_di  = ctx.df_1hr.iloc[-1].get("plus_di")
-            minus_di = ctx.df_1hr.iloc[-1].get("minus_di")
-            if adx is not None and not pd.isna(adx):
-                adx = float(adx)
+        if last_1hr:
+            adx = last_1hr["adx"]
+            plus_di  = last_1hr["plus_di"]
+            minus_di = last_1hr["minus_di"]
+            if adx is not None and not math.isnan(adx):
                 if adx >= 25:
                     # Trend is strong — check DI alignment
                     if plus_di is not None and minus_di is not None:
-                        pdi, mdi = float(plus_di), float(minus_di)
-                        if (pdi > mdi and sign > 0) or (mdi > pdi and sign < 0):
+                        if (plus_di > minus_di and sign > 0) or (minus_di > plus_di and sign < 0):
                             score += 6.0   # DI aligned with direction
                         else:
                             score -= 3.0   # DI counter to direction in a strong trend
@@ -238,13 +322,11 @@ class BaseStrategy(ABC):
 
         # ── 8. Bollinger Band position (6 pts) ──
         # LONG: price near lower band (value area), SHORT: price near upper band
-        if ctx.df_1min is not None and not ctx.df_1min.empty:
-            row_bb = ctx.df_1min.iloc[-1]
-            close   = row_bb.get("close")
-            bb_upper = row_bb.get("bb_upper")
-            bb_lower = row_bb.get("bb_lower")
-            if all(v is not None and not pd.isna(v) for v in [close, bb_upper, bb_lower]):
-                close, bb_upper, bb_lower = float(close), float(bb_upper), float(bb_lower)
+        if last_1min:
+            close    = last_1min["close"]
+            bb_upper = last_1min["bb_upper"]
+            bb_lower = last_1min["bb_lower"]
+            if all(v is not None and not math.isnan(v) for v in [close, bb_upper, bb_lower]):
                 bb_range = bb_upper - bb_lower
                 if bb_range > 0:
                     bb_pct = (close - bb_lower) / bb_range   # 0 = lower band, 1 = upper band
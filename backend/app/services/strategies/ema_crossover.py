@@ -10,7 +10,7 @@ from typing import Optional
 import pandas as pd
 
 from app.services.strategies.base import (
-    BaseStrategy, TradeSignal, ExitSignal, Direction, ExitReason,
+    BaseStrategy, TradeSignal, ExitSignal, Direction, ExitReason, _any_nan,
 )
 
 
@@ -43,7 +43,7 @@ class EMACrossoverStrategy(BaseStrategy):
         prev = df.iloc[idx - 1]
 
         t = current_time.time() if isinstance(current_time, datetime) else current_time
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t < time(10, 0) or t >= eod:
             return None
 
@@ -60,9 +60,8 @@ class EMACrossoverStrategy(BaseStrategy):
         vol_ratio = row.get("vol_ratio", 1.0)
 
         # Validate indicators exist
-        for val in [ema9, ema21, prev_ema9, prev_ema21, rsi, macd_hist, adx, vwap, atr]:
-            if val is None or (isinstance(val, float) and pd.isna(val)):
-                return None
+        if _any_nan(ema9, ema21, prev_ema9, prev_ema21, rsi, macd_hist, adx, vwap, atr):
+            return None
 
         # Volume confirmation at crossover bar — crossovers on low volume whipsaw ~60% of the time
         if pd.isna(vol_ratio) or float(vol_ratio) < 1.3:
@@ -129,7 +128,7 @@ class EMACrossoverStrategy(BaseStrategy):
         atr = row.get("atr", 0)
 
         t = current_time.time() if isinstance(current_time, datetime) else current_time
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t >= eod:
             return ExitSignal(reason=ExitReason.EOD, exit_price=close, timestamp=current_time)
 
@@ -20,7 +20,7 @@ from typing import Optional
 import pandas as pd
 
 from app.services.strategies.base import (
-    BaseStrategy, TradeSignal, ExitSignal, Direction, ExitReason,
+    BaseStrategy, TradeSignal, ExitSignal, Direction, ExitReason, _any_nan,
 )
 
 
@@ -51,7 +51,7 @@ class KeltnerBreakoutStrategy(BaseStrategy):
         row = df.iloc[idx]
 
         t   = current_time.time() if isinstance(current_time, datetime) else current_time
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t < time(10, 0) or t >= eod:
             return None
 
@@ -64,9 +64,8 @@ class KeltnerBreakoutStrategy(BaseStrategy):
         atr       = row.get("atr")
         adx       = row.get("adx")
 
-        for val in [kc_upper, kc_lower, vol_ratio, rsi, vwap, atr]:
-            if val is None or (isinstance(val, float) and pd.isna(val)):
-                return None
+        if _any_nan(kc_upper, kc_lower, vol_ratio, rsi, vwap, atr):
+            return None
 
         if vol_ratio < p["vol_ratio_min"]:
             return None
@@ -123,7 +122,7 @@ class KeltnerBreakoutStrategy(BaseStrategy):
         atr   = row.get("atr", 0) or 0
 
         t   = current_time.time() if isinstance(current_time, datetime) else current_time
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t >= eod:
             return ExitSignal(ExitReason.EOD, close, current_time)
 
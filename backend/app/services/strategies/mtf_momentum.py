@@ -134,7 +134,7 @@ class MTFMomentumStrategy(BaseStrategy):
 
         p = self.params
         t = current_time.time() if isinstance(current_time, datetime) else current_time
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t < time(10, 0) or t >= eod:
             return None
 
@@ -234,7 +234,7 @@ class MTFMomentumStrategy(BaseStrategy):
         atr = float(row.get("atr", 0))
 
         t = current_time.time() if isinstance(current_time, datetime) else current_time
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t >= eod:
             return ExitSignal(reason=ExitReason.EOD, exit_price=close, timestamp=current_time)
 
@@ -219,7 +219,7 @@ class ORBScalpStrategy(BaseStrategy):
             return ExitSignal(reason=ExitReason.TIME_STOP, exit_price=close, timestamp=current_time)
 
         # EOD exit as fallback
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t >= eod:
             return ExitSignal(reason=ExitReason.EOD, exit_price=close, timestamp=current_time)
 
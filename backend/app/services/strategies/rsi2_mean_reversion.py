@@ -21,7 +21,7 @@ import pandas as pd
 import numpy as np
 
 from app.services.strategies.base import (
-    BaseStrategy, TradeSignal, ExitSignal, Direction, ExitReason,
+    BaseStrategy, TradeSignal, ExitSignal, Direction, ExitReason, _any_nan,
 )
 
 
@@ -61,7 +61,7 @@ class RSI2MeanReversionStrategy(BaseStrategy):
 
         p   = self.params
         t   = current_time.time() if isinstance(current_time, datetime) else current_time
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t < time(10, 0) or t >= eod:
             return None
 
@@ -72,9 +72,8 @@ class RSI2MeanReversionStrategy(BaseStrategy):
         atr   = row.get("atr")
         vwap  = row.get("vwap")
 
-        for val in [rsi14, ema200, atr, vwap]:
-            if val is None or (isinstance(val, float) and pd.isna(val)):
-                return None
+        if _any_nan(rsi14, ema200, atr, vwap):
+            return None
 
         # Compute RSI(2) on the fly for the last 20 bars
         rsi2_series = self._compute_rsi2(df["close"].iloc[max(0, idx - 20):idx + 1])
@@ -132,7 +131,7 @@ class RSI2MeanReversionStrategy(BaseStrategy):
         atr   = row.get("atr", 0) or 0
 
         t   = current_time.time() if isinstance(current_time, datetime) else current_time
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t >= eod:
             return ExitSignal(ExitReason.EOD, close, current_time)
 
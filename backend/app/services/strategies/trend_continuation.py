@@ -68,7 +68,7 @@ class TrendContinuationStrategy(BaseStrategy):
         _open_total = 9 * 60 + 30 + p["min_minutes_after_open"]
         min_open = time(_open_total // 60, _open_total % 60)
         max_entry = time(*[int(x) for x in p["max_entry_time"].split(":")])
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
 
         if t < min_open or t >= max_entry or t >= eod:
             return None
@@ -195,7 +195,7 @@ class TrendContinuationStrategy(BaseStrategy):
         close = float(row["close"])
         t = current_time.time() if isinstance(current_time, datetime) else current_time
 
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t >= eod:
             return ExitSignal(reason=ExitReason.EOD, exit_price=close, timestamp=current_time)
 
@@ -61,7 +61,7 @@ class VolSpikeStrategy(BaseStrategy):
 
         min_time = time(*[int(x) for x in p["min_entry_time"].split(":")])
         max_time = time(*[int(x) for x in p["max_entry_time"].split(":")])
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
 
         if t < min_time or t >= max_time or t >= eod:
             return None
@@ -152,7 +152,7 @@ class VolSpikeStrategy(BaseStrategy):
         close = float(row["close"])
         t = current_time.time() if isinstance(current_time, datetime) else current_time
 
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t >= eod:
             return ExitSignal(reason=ExitReason.TIME_STOP, exit_price=close, timestamp=current_time)
 
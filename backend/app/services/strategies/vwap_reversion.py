@@ -42,7 +42,7 @@ class VWAPReversionStrategy(BaseStrategy):
 
         # Time filters
         t = current_time.time() if isinstance(current_time, datetime) else current_time
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         # Block 9:30-10:00 (no volume anchor) and 2:30-close (MOC imbalance distortion)
         if t < time(10, 0) or t >= time(14, 30) or t >= eod:
             return None
@@ -117,7 +117,7 @@ class VWAPReversionStrategy(BaseStrategy):
 
         # EOD exit
         t = current_time.time() if isinstance(current_time, datetime) else current_time
-        eod = time(*[int(x) for x in p["eod_exit_time"].split(":")])
+        eod = self._eod
         if t >= eod:
             return ExitSignal(reason=ExitReason.EOD, exit_price=close, timestamp=current_time)
 
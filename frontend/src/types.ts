@@ -353,8 +353,11 @@ export interface RollingStrategyPerf {
   total_pnl: number;
   avg_win: number;
   avg_loss: number;
+  avg_pnl_ci95: [number, number];
   cvar_95: number;
+  cvar_95_ci95: [number, number];
   omega: number;
+  omega_ci95: [number, number];
   insufficient_data: boolean;
   retire_recommended: boolean;
 }